@@ -1 +1,4 @@
-from bot.backtesting.backtest import Backtester
\ No newline at end of file
+from bot.backtesting.backtest import Backtester
+from bot.backtesting.sweep import ParameterSweep
+from bot.backtesting.session_replay import SessionReplay
+from bot.backtesting.walk_forward import WalkForward
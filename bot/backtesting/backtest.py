@@ -2,10 +2,16 @@ import logging
 from datetime import datetime
 from time import sleep
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
+import numpy as np
+import polars as pl
 
 from bot.strategy import BettingStrategy, RiskManager
-from bot.data_source import DataSource, BetHistory, RoundResult, IterationHistory, DecidedMultiplier
+from bot.data_source import DataSource, BetHistoryStore, RoundResult, IterationHistory, DecidedMultiplier, BetStatistics
+from bot.backtesting.vectorized import simulate_rounds, bet_history_frame, simulated_statistics
+from bot.backtesting.clock import BacktestClock
+from bot.backtesting.result_cache import BacktestResultCache
+from bot.indicators import IndicatorPipeline
 
 
 logging.basicConfig(
@@ -28,37 +34,80 @@ class Backtester(BaseModel):
     end_time: str = '23:59:59'
     initial_balance: float
     current_balance: float = 0.0
-    bet_history: list[BetHistory] = []
+    bet_history: BetHistoryStore = Field(default_factory=BetHistoryStore)
     iteration_history: list[IterationHistory] = []
+    statistics: BetStatistics = Field(default_factory=BetStatistics)
     consistent: bool = True
     continuous: bool = True
     live_bet_history_file: str = None
+    live_bet_history: pl.DataFrame = None
     iteration_wait_rounds: int = 0
+    vectorized: bool = False
+    bet_history_frame: pl.DataFrame = None
+    clock: BacktestClock = Field(default_factory=BacktestClock)
+    indicators: IndicatorPipeline = Field(default_factory=IndicatorPipeline)
+    result_cache: BacktestResultCache = None
+    cached_summary: dict = None
+
+    @property
+    def replays_live_bet_history(self) -> bool:
+        return bool(self.live_bet_history_file) or self.live_bet_history is not None
+
+    def get_historical_data(self) -> pl.DataFrame:
+        """Returns the rounds to simulate, either from a live bet history or the data source."""
+        if self.live_bet_history is not None:
+            self.data_source.repurpose_bet_history(self.live_bet_history)
+            return self.data_source.data
+        if self.live_bet_history_file:
+            self.data_source.repurpose_live_bet_history(self.live_bet_history_file)
+            return self.data_source.data
+        if not self.data_source.indexed:
+            self.data_source.build_index()
+        return self.data_source.get_data_by_date_and_time(
+            start_date=self.start_date,
+            end_date=self.end_date,
+            start_time=self.start_time,
+            end_time=self.end_time
+        )
 
     def run(self):
-        """Simulates running the strategy on historical data."""
+        """
+        Simulates running the strategy on historical data. With a result cache, an identical earlier run is
+        restored instead, leaving the bet history empty, and a new run is stored once it finishes.
+        """
+        key = self.result_cache.key(self) if self.result_cache is not None else None
+        if key is not None:
+            result = self.result_cache.get(key)
+            if result is not None:
+                self.restore_result(result)
+                logging.info(f'Restored backtest result {key} from the cache')
+                return
+        if self.vectorized:
+            self.run_vectorized()
+        else:
+            self.run_rounds()
+        if key is not None:
+            self.result_cache.put(key, self.cacheable_result())
+
+    def run_rounds(self):
+        """Simulates the strategy one round at a time."""
         self.strategy.log = logging
         self.risk_manager.log = logging
+        self.strategy.statistics = self.statistics
         self.strategy.is_backtest = True
+        self.strategy.clock = self.clock
+        self.strategy.indicators = self.indicators
+        self.strategy.register_indicators(self.indicators)
         self.strategy.introduce_strategy()
         self.current_balance = self.initial_balance
         self.risk_manager.balance_for_stop_loss = self.initial_balance
-        if self.live_bet_history_file:
-            self.data_source.repurpose_live_bet_history(self.live_bet_history_file)
-            historical_data = self.data_source.data.to_dicts()
-        else:
-            historical_data = self.data_source.get_data_by_date_and_time(
-                start_date=self.start_date,
-                end_date=self.end_date,
-                start_time=self.start_time,
-                end_time=self.end_time
-            ).to_dicts()
+        historical_data = self.get_historical_data().to_dicts()
         iteration = 1
         restart_strategy = False
         iteration_wait_rounds_count = 0
         for hd in historical_data:
             self.current_balance = round(self.current_balance, 2)
-            if not self.live_bet_history_file:
+            if not self.replays_live_bet_history:
                 data = self.data_source.get_data_before_date_and_time(
                     start_date=hd['date'],
                     look_back=self.look_back,
@@ -86,7 +135,7 @@ class Backtester(BaseModel):
                 iteration_wait_rounds_count = self.iteration_wait_rounds
             if self.risk_manager.check_risk(self.initial_balance, self.current_balance) and iteration_wait_rounds_count <= 0:
                 try:
-                    decided_multiplier: DecidedMultiplier = self.strategy.decide_multiplier(game_data=data if not self.live_bet_history_file else historical_data, bet_history=self.bet_history, restart_strategy=restart_strategy)
+                    decided_multiplier: DecidedMultiplier = self.strategy.decide_multiplier(game_data=data if not self.replays_live_bet_history else historical_data, bet_history=self.bet_history, restart_strategy=restart_strategy)
                 except Exception as e:
                     print(e)
                     decided_multiplier = DecidedMultiplier(
@@ -118,51 +167,51 @@ class Backtester(BaseModel):
                     RoundResult.WIN if decided_multiplier.multiplier_for_box_two > 1.0 and decided_multiplier.multiplier_for_box_two <= hd['multiplier'] else RoundResult.LOSS
                 )
 
-                self.bet_history.append(bh := BetHistory(
+                self.bet_history.append_round(
                     round_number=hd['game_round'],
                     date=hd['date'],
                     time=hd['time'],
                     bet_amount_for_box_one=bet_amount_for_box_one,
                     bet_amount_for_box_two=bet_amount_for_box_two,
                     multiplier=hd['multiplier'],
-                    decided_multiplier=decided_multiplier,
+                    multiplier_for_box_one=decided_multiplier.multiplier_for_box_one,
+                    multiplier_for_box_two=decided_multiplier.multiplier_for_box_two,
                     result_one=result_one,
                     result_two=result_two,
                     initial_balance=self.initial_balance,
                     current_balance=(self.current_balance),
-                    multiplier_category='B' if 1.00 <= hd['multiplier'] <= 1.99 else 'P' if 2.00 <= hd['multiplier'] <= 9.99 else 'Pk',
-                    decided_multiplier_one_category='B' if 1.00 <= decided_multiplier.multiplier_for_box_one <= 1.99 else 'P' if 2.00 <= decided_multiplier.multiplier_for_box_one <= 9.99 else 'Pk',
-                    decided_multiplier_two_category='B' if 1.00 <= decided_multiplier.multiplier_for_box_two <= 1.99 else 'P' if 2.00 <= decided_multiplier.multiplier_for_box_two <= 9.99 else 'Pk',
-                ))
+                    multiplier_category_code=hd['multiplier_category_code'],
+                )
+                bh = self.bet_history[-1]
                 logging.info(bh)
-
-                winnings_1 = [history for history in self.bet_history if history.result_one == RoundResult.WIN]
-                winnings_2 = [history for history in self.bet_history if history.result_two == RoundResult.WIN]
-                total_winnings = len(winnings_1) + len(winnings_2)
-                logging.info(f'Total Number of Winnings: {total_winnings}')
+                self.statistics.update(bh)
+                logging.info(f'Total Number of Winnings: {self.statistics.total_wins}')
 
                 restart_strategy = False
             else:
                 iteration_wait_rounds_count -= 1
-                self.bet_history.append(bh := BetHistory(
+                self.bet_history.append_round(
                     round_number=hd['game_round'],
                     date=hd['date'],
                     time=hd['time'],
                     bet_amount_for_box_one=bet_amount_for_box_one,
                     bet_amount_for_box_two=bet_amount_for_box_two,
                     multiplier=hd['multiplier'],
-                    decided_multiplier=DecidedMultiplier(multiplier_for_box_one=1.00, multiplier_for_box_two=1.0),
+                    multiplier_for_box_one=1.00,
+                    multiplier_for_box_two=1.00,
                     result_one=RoundResult.DRAW,
                     result_two=RoundResult.DRAW,
                     initial_balance=self.initial_balance,
                     current_balance=(self.current_balance),
-                    multiplier_category='B' if 1.00 <= hd['multiplier'] <= 1.99 else 'P' if 2.00 <= hd['multiplier'] <= 9.99 else 'Pk',
-                    decided_multiplier_one_category='B' if 1.00 <= decided_multiplier.multiplier_for_box_one <= 1.99 else 'P' if 2.00 <= decided_multiplier.multiplier_for_box_one <= 9.99 else 'Pk',
-                    decided_multiplier_two_category='B' if 1.00 <= decided_multiplier.multiplier_for_box_two <= 1.99 else 'P' if 2.00 <= decided_multiplier.multiplier_for_box_two <= 9.99 else 'Pk',
-                ))
+                    multiplier_category_code=hd['multiplier_category_code'],
+                )
+                bh = self.bet_history[-1]
                 logging.info(bh)
+                self.statistics.update(bh)
                 logging.info(f'Waiting for {iteration_wait_rounds_count} of {self.iteration_wait_rounds} rounds to place a bet')
+            self.indicators.update(hd['multiplier'])
             self.strategy.after_game_round_during_backtesting()
+            self.clock.advance()
         if not self.continuous:
             profit = (self.current_balance - self.initial_balance) if self.current_balance > self.initial_balance else 0.0
             loss = (self.initial_balance - self.current_balance) if self.initial_balance > self.current_balance else 0.0
@@ -176,11 +225,84 @@ class Backtester(BaseModel):
                 loss_percentage=loss_percentage
             ))
             logging.info(ih)
-        
+
+    def run_vectorized(self):
+        """
+        Simulates the strategy on historical data with array operations instead of a per-round loop.
+        The strategy must implement decide_multipliers, emitting the decision for every round up front.
+        """
+        self.strategy.log = logging
+        self.risk_manager.log = logging
+        self.strategy.is_backtest = True
+        self.strategy.introduce_strategy()
+        historical_data = self.get_historical_data()
+        box_one, box_two = self.strategy.decide_multipliers(game_data=historical_data)
+        simulation = simulate_rounds(
+            multipliers=historical_data['multiplier'].to_numpy(),
+            box_one=np.asarray(box_one, dtype=np.float64),
+            box_two=np.asarray(box_two, dtype=np.float64),
+            initial_balance=self.initial_balance,
+            calculate_bet_amount_for_box_one=self.strategy.calculate_bet_amount_for_box_one,
+            calculate_bet_amount_for_box_two=self.strategy.calculate_bet_amount_for_box_two,
+            stop_loss=self.risk_manager.stop_loss,
+            take_profit=self.risk_manager.take_profit,
+            consistent=self.consistent,
+            continuous=self.continuous,
+            iteration_wait_rounds=self.iteration_wait_rounds,
+        )
+        self.bet_history_frame = bet_history_frame(historical_data, simulation)
+        self.bet_history = BetHistoryStore.from_frame(self.bet_history_frame)
+        self.statistics = simulated_statistics(simulation)
+        self.strategy.statistics = self.statistics
+        self.iteration_history.extend(simulation['iteration_history'])
+        for ih in simulation['iteration_history']:
+            logging.info(ih)
+        self.initial_balance = simulation['final_initial_balance']
+        self.current_balance = simulation['final_balance']
+        self.risk_manager.balance_for_stop_loss = simulation['balance_for_stop_loss']
+        logging.info(f'Simulated {len(historical_data)} rounds, final balance: {self.current_balance}')
 
     def get_results(self):
         """Returns the results of the backtest."""
         return {
             'iteration_history': self.iteration_history,
             'bet_history': self.bet_history,
-        }
\ No newline at end of file
+        }
+
+    def cacheable_result(self) -> dict:
+        """Returns what BacktestResultCache stores for a finished run."""
+        return {
+            'iteration_history': [ih.model_dump(mode='json') for ih in self.iteration_history],
+            'summary': self.get_summary(),
+            'initial_balance': self.initial_balance,
+            'current_balance': self.current_balance,
+            'balance_for_stop_loss': self.risk_manager.balance_for_stop_loss,
+        }
+
+    def restore_result(self, result: dict) -> None:
+        """Restores a run stored by BacktestResultCache, as if it had just finished."""
+        self.iteration_history.extend(IterationHistory(**ih) for ih in result['iteration_history'])
+        self.cached_summary = result['summary']
+        self.initial_balance = result['initial_balance']
+        self.current_balance = result['current_balance']
+        self.risk_manager.balance_for_stop_loss = result['balance_for_stop_loss']
+
+    def get_summary(self) -> dict:
+        """Summarizes the iterations and bet statistics of the backtest in a single row."""
+        if self.cached_summary is not None:
+            return dict(self.cached_summary)
+        total_profit = sum((ih.profit for ih in self.iteration_history), 0.0)
+        total_loss = sum((ih.loss for ih in self.iteration_history), 0.0)
+        return {
+            'iterations': len(self.iteration_history),
+            'profitable_iterations': sum(1 for ih in self.iteration_history if ih.profit > 0),
+            'total_profit': round(total_profit, 2),
+            'total_loss': round(total_loss, 2),
+            'net_profit': self.statistics.profit_and_loss,
+            'final_balance': round(self.current_balance, 2),
+            'rounds': self.statistics.rounds,
+            'wins': self.statistics.total_wins,
+            'losses': self.statistics.total_losses,
+            'max_drawdown': round(self.statistics.max_drawdown, 2),
+            'max_drawdown_percentage': round(self.statistics.max_drawdown_percentage, 2),
+        }
@@ -0,0 +1,237 @@
+import sys
+import time
+import inspect
+import logging
+import importlib
+import tracemalloc
+from typing import Callable, NamedTuple
+from collections.abc import Sequence
+
+from pydantic import BaseModel, ConfigDict
+import numpy as np
+import polars as pl
+
+from bot.strategy import BettingStrategy
+from bot.data_source import BetHistoryStore, BetStatistics, RoundResult
+from bot.data_source.bet_history_store import RESULT_CODES
+from bot.backtesting.clock import BacktestClock
+from bot.indicators import IndicatorPipeline
+
+
+HISTORY_SIZES = [100, 1_000, 10_000, 100_000, 1_000_000]
+
+
+def module_strategy(module: str) -> Callable[[], BettingStrategy]:
+    """Returns a factory copying the strategy a top-level strategy script configures."""
+    def factory() -> BettingStrategy:
+        return importlib.import_module(module).strategy.model_copy(deep=True)
+    return factory
+
+
+def strategy_class(module: str, name: str, **parameters) -> Callable[[], BettingStrategy]:
+    """Returns a factory building a strategy class with a small bet percentage and the given parameters."""
+    def factory() -> BettingStrategy:
+        return getattr(importlib.import_module(module), name)(
+            percentage_to_bet_per_round_for_box_one=0.001,
+            percentage_to_bet_per_round_for_box_two=0.001,
+            **parameters,
+        )
+    return factory
+
+
+STRATEGIES: dict[str, Callable[[], BettingStrategy]] = {
+    'EagleShot': module_strategy('eagle_shot'),
+    'LossLurker': module_strategy('loss_lurker'),
+    'MarkovNgramStrategy': module_strategy('markov_ngram_strategy'),
+    'SMACrossOver': strategy_class('bot.strategies.sma_cross_over', 'SMACrossOver'),
+    'MartingaleStrategy': strategy_class('bot.strategies.martingale_strategy', 'MartingaleStrategy'),
+    'DoubleLossLurker': strategy_class('bot.strategies.double_loss_lurker', 'DoubleLossLurker'),
+    'TripleLossLurker': strategy_class('bot.strategies.triple_loss_lurker', 'TripleLossLurker'),
+    'SuperLossLurker': strategy_class('bot.strategies.super_loss_lurker', 'SuperLossLurker'),
+    'TenthLossLurker': strategy_class('bot.strategies.tenth_loss_lurker', 'TenthLossLurker'),
+}
+
+SINGLE_BOX_STRATEGIES = {'MartingaleStrategy', 'DoubleLossLurker', 'TripleLossLurker', 'SuperLossLurker', 'TenthLossLurker'}
+
+
+class SingleBoxRound(NamedTuple):
+    """A round as the single-box strategies in bot.strategies read it: one multiplier and one result."""
+    multiplier: float
+    result: RoundResult
+
+
+class SingleBoxHistory(Sequence):
+    """Presents a BetHistoryStore as the single-box history those strategies expect, with box one's result."""
+    def __init__(self, bet_history: BetHistoryStore):
+        self.bet_history = bet_history
+
+    def __len__(self) -> int:
+        return len(self.bet_history)
+
+    def __getitem__(self, index: int | slice) -> SingleBoxRound | list[SingleBoxRound]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('bet history index out of range')
+        return SingleBoxRound(float(self.bet_history.multipliers[index]), RESULT_CODES[self.bet_history.results_one[index]])
+
+
+def synthetic_rounds(rounds: int, seed: int = 0) -> pl.DataFrame:
+    """
+    Generates rounds laid out like bot.backtesting.vectorized.bet_history_frame, with crash multipliers drawn from
+    0.97 / (1 - U) cut to two decimals and random bets and results.
+    """
+    rng = np.random.default_rng(seed)
+    multipliers = np.maximum(np.floor(0.97 / (1.0 - rng.random(rounds)) * 100) / 100, 1.00)
+    seconds = np.arange(rounds) * 10
+    decided = rng.choice([1.00, 1.00, 2.00, 3.00, 10.00], size=(2, rounds))
+    results = np.where(
+        decided == 1.00,
+        RESULT_CODES.index(RoundResult.DRAW),
+        np.where(decided <= multipliers, RESULT_CODES.index(RoundResult.WIN), RESULT_CODES.index(RoundResult.LOSS)),
+    ).astype(np.int8)
+    return pl.DataFrame({
+        'round_number': np.arange(rounds),
+        'date': [f'2025-{1 + day // 28 % 12:02d}-{1 + day % 28:02d}' for day in (seconds // 86400).tolist()],
+        'time': [f'{s // 3600 % 24:02d}:{s // 60 % 60:02d}:{s % 60:02d}' for s in seconds.tolist()],
+        'bet_amount_for_box_one': np.full(rounds, 10.0),
+        'bet_amount_for_box_two': np.full(rounds, 10.0),
+        'multiplier': multipliers,
+        'multiplier_for_box_one': decided[0],
+        'multiplier_for_box_two': decided[1],
+        'result_one': results[0],
+        'result_two': results[1],
+        'initial_balance': np.full(rounds, 10000.0),
+        'current_balance': np.full(rounds, 10000.0),
+    })
+
+
+class StrategyBenchmark(BaseModel):
+    """
+    Times each strategy's decide_multiplier against synthetic bet histories of growing size.
+
+    For every history size the strategy starts from a history of that many rounds, makes one untimed decision so that
+    incremental state catches up, then decides `rounds` more times while a new round is appended after each decision,
+    the way the Backtester and the Executor drive it. A second pass of allocation_rounds decisions runs under
+    tracemalloc and reports the largest allocation peak of a single decision. Logging is disabled while timing.
+    A strategy is over budget when its p99 decision time exceeds budget_ms.
+    Each strategy is called with the arguments its decide_multiplier accepts, and the single_box strategies are
+    given their history as a SingleBoxHistory.
+    """
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+    strategies: dict[str, Callable[[], BettingStrategy]] = STRATEGIES
+    history_sizes: list[int] = HISTORY_SIZES
+    rounds: int = 200
+    allocation_rounds: int = 20
+    budget_ms: float = 50.0
+    single_box: set[str] = SINGLE_BOX_STRATEGIES
+    seed: int = 0
+
+    def run(self) -> pl.DataFrame:
+        """Benchmarks every strategy at every history size and returns one row per pair."""
+        logging.disable(logging.INFO)
+        frame = synthetic_rounds(max(self.history_sizes) + self.rounds + self.allocation_rounds + 1, self.seed)
+        results = []
+        for name, factory in self.strategies.items():
+            for history_size in self.history_sizes:
+                results.append({'strategy': name, 'history': history_size, **self.benchmark(factory, frame, history_size, name in self.single_box)})
+        return pl.DataFrame(results, schema_overrides={'p50_ms': pl.Float64, 'p99_ms': pl.Float64, 'max_ms': pl.Float64, 'peak_kib': pl.Float64})
+
+    def benchmark(self, factory: Callable[[], BettingStrategy], frame: pl.DataFrame, history_size: int, single_box: bool = False) -> dict:
+        result = {'p50_ms': None, 'p99_ms': None, 'max_ms': None, 'peak_kib': None, 'over_budget': False, 'error': None}
+        try:
+            strategy = factory()
+        except Exception as e:
+            result['error'] = f'{type(e).__name__}: {e}'
+            return result
+        strategy.log = logging
+        strategy.is_backtest = True
+        strategy.statistics = BetStatistics()
+        strategy.clock = BacktestClock()
+        strategy.indicators = IndicatorPipeline()
+        strategy.register_indicators(strategy.indicators)
+        bet_history = BetHistoryStore.from_frame(frame.head(history_size))
+        if strategy.indicators.indicators:
+            for multiplier in bet_history.multipliers.tolist():
+                strategy.indicators.update(multiplier)
+        upcoming = frame.slice(history_size, self.rounds + self.allocation_rounds + 1).to_dicts()
+        game_data = frame.head(history_size).select('date', 'time', 'multiplier')
+        arguments = {'game_data': game_data, 'bet_history': SingleBoxHistory(bet_history) if single_box else bet_history}
+        if 'restart_strategy' in inspect.signature(strategy.decide_multiplier).parameters:
+            arguments['restart_strategy'] = False
+
+        def play(hd: dict) -> None:
+            bet_history.append_round(
+                round_number=hd['round_number'],
+                date=hd['date'],
+                time=hd['time'],
+                bet_amount_for_box_one=hd['bet_amount_for_box_one'],
+                bet_amount_for_box_two=hd['bet_amount_for_box_two'],
+                multiplier=hd['multiplier'],
+                multiplier_for_box_one=hd['multiplier_for_box_one'],
+                multiplier_for_box_two=hd['multiplier_for_box_two'],
+                result_one=RESULT_CODES[hd['result_one']],
+                result_two=RESULT_CODES[hd['result_two']],
+                initial_balance=hd['initial_balance'],
+                current_balance=hd['current_balance'],
+            )
+            strategy.statistics.update(bet_history[-1])
+            strategy.indicators.update(hd['multiplier'])
+            strategy.clock.advance()
+
+        timings = []
+        peaks = []
+        try:
+            strategy.decide_multiplier(**arguments)
+            play(upcoming[0])
+            for hd in upcoming[1:self.rounds + 1]:
+                start = time.perf_counter()
+                strategy.decide_multiplier(**arguments)
+                timings.append(time.perf_counter() - start)
+                play(hd)
+            tracemalloc.start()
+            try:
+                for hd in upcoming[self.rounds + 1:self.rounds + 1 + self.allocation_rounds]:
+                    current, _ = tracemalloc.get_traced_memory()
+                    tracemalloc.reset_peak()
+                    strategy.decide_multiplier(**arguments)
+                    peaks.append(tracemalloc.get_traced_memory()[1] - current)
+                    play(hd)
+            finally:
+                tracemalloc.stop()
+        except Exception as e:
+            result['error'] = f'{type(e).__name__}: {e}'
+        if timings:
+            timings_ms = np.array(timings) * 1000
+            result['p50_ms'] = round(float(np.percentile(timings_ms, 50)), 4)
+            result['p99_ms'] = round(float(np.percentile(timings_ms, 99)), 4)
+            result['max_ms'] = round(float(timings_ms.max()), 4)
+            result['over_budget'] = result['p99_ms'] > self.budget_ms
+        if peaks:
+            result['peak_kib'] = round(max(peaks) / 1024, 2)
+        return result
+
+
+if __name__ == '__main__':
+    # Usage: python -m bot.backtesting.benchmark [budget_ms] [largest_history] [strategy ...]
+    budget_ms = float(sys.argv[1]) if len(sys.argv) > 1 else 50.0
+    largest_history = int(sys.argv[2]) if len(sys.argv) > 2 else HISTORY_SIZES[-1]
+    names = sys.argv[3:] or list(STRATEGIES)
+    benchmark = StrategyBenchmark(
+        strategies={name: STRATEGIES[name] for name in names},
+        history_sizes=[size for size in HISTORY_SIZES if size <= largest_history],
+        budget_ms=budget_ms,
+    )
+    results = benchmark.run()
+    with pl.Config(tbl_rows=-1, tbl_cols=-1, fmt_str_lengths=80):
+        print(results)
+    over_budget = results.filter(pl.col('over_budget'))
+    if not over_budget.is_empty():
+        print(f'{over_budget["strategy"].n_unique()} strategies exceeded the {budget_ms} ms per round budget')
+    failed = results.filter(pl.col('error').is_not_null())
+    if not failed.is_empty():
+        print(f'{failed["strategy"].n_unique()} strategies failed: {", ".join(failed["strategy"].unique(maintain_order=True))}')
+    if not over_budget.is_empty() or not failed.is_empty():
+        sys.exit(1)
@@ -0,0 +1,57 @@
+import heapq
+from typing import Any, Callable
+
+
+class ScheduledTask:
+    """A task scheduled on a BacktestClock, with its result once it has run."""
+    def __init__(self, due_round: int, task: Callable, args: tuple, kwargs: dict):
+        self.due_round = due_round
+        self.task = task
+        self.args = args
+        self.kwargs = kwargs
+        self.done = False
+        self.result: Any = None
+
+    def run(self) -> None:
+        self.result = self.task(*self.args, **self.kwargs)
+        self.done = True
+
+
+class BacktestClock:
+    """
+    Simulated time for backtests, counted in rounds.
+
+    Work a live strategy would hand to a background worker, such as n-gram regeneration, is scheduled to finish a
+    number of rounds later instead. The Backtester advances the clock after every round and runs the tasks that
+    have come due, in the order they were scheduled, before the strategy decides the next round. Backtests therefore
+    never wait on wall-clock time and give the same results on every run.
+    """
+    def __init__(self):
+        self.round = 0
+        self.sequence = 0
+        self.pending: list[tuple[int, int, ScheduledTask]] = []
+
+    def schedule(self, task: Callable, *args, delay_rounds: int = 1, **kwargs) -> ScheduledTask:
+        """Schedules task(*args, **kwargs) to run once delay_rounds more rounds have been played."""
+        if delay_rounds < 0:
+            raise ValueError('delay_rounds must not be negative')
+        scheduled_task = ScheduledTask(self.round + delay_rounds, task, args, kwargs)
+        heapq.heappush(self.pending, (scheduled_task.due_round, self.sequence, scheduled_task))
+        self.sequence += 1
+        if delay_rounds == 0:
+            self.run_due_tasks()
+        return scheduled_task
+
+    def run_due_tasks(self) -> None:
+        while self.pending and self.pending[0][0] <= self.round:
+            heapq.heappop(self.pending)[2].run()
+
+    def advance(self, rounds: int = 1) -> None:
+        """Moves the clock forward and runs the tasks that have come due."""
+        self.round += rounds
+        self.run_due_tasks()
+
+    def reset(self) -> None:
+        self.round = 0
+        self.sequence = 0
+        self.pending.clear()
@@ -0,0 +1,178 @@
+import sys
+import time
+import importlib
+
+from pydantic import BaseModel, ConfigDict
+import numpy as np
+import polars as pl
+
+from bot.strategy import BettingStrategy, RiskManager
+from bot.data_source import DataSource, BetHistoryStore
+from bot.backtesting.vectorized import MINIMUM_BET_AMOUNT
+
+
+OPEN, STOP_LOSS, TAKE_PROFIT = range(3)
+QUANTILES = [0.5, 0.9, 0.99]
+
+
+def decided_targets(bet_history: BetHistoryStore) -> np.ndarray:
+    """
+    Returns the multipliers a strategy decided for both boxes in every round of a backtest, as an array of
+    (box one, box two) pairs. Rounds it sat out are kept as (1.00, 1.00) so that sampling the pairs also
+    reproduces how often the strategy bets.
+    """
+    return np.column_stack([bet_history.column('multiplier_for_box_one'), bet_history.column('multiplier_for_box_two')])
+
+
+def seconds_per_round(data: pl.DataFrame) -> float:
+    """Median time between consecutive rounds, in seconds. Gaps between sessions barely move the median."""
+    datetimes = pl.concat_str([pl.col('date'), pl.col('time')], separator=' ').str.to_datetime('%Y-%m-%d %H:%M:%S')
+    gaps = data.select(datetimes.sort().diff().dt.total_seconds().alias('gap'))['gap']
+    gaps = gaps.filter(gaps > 0)
+    return float(gaps.median()) if len(gaps) else 0.0
+
+
+class RiskOfRuinSimulator(BaseModel):
+    """
+    Bootstraps balance paths from the empirical multiplier distribution of a DataSource to estimate how a
+    RiskManager setting ends a single iteration of a strategy.
+
+    Each path draws its multipliers and its decided (box one, box two) targets independently and uniformly from
+    the recorded rounds and targets. Bets, payouts and the trailing stop loss follow Backtester.run and
+    RiskManager.check_risk: bets are what the strategy's calculate_bet_amount_for_box_one and _two give for the
+    initial balance (or for the current balance when not consistent), at least MINIMUM_BET_AMOUNT, and a path stops
+    before the first round at which its balance is at or below (1 - stop_loss) times its highest balance so far, or
+    at or above (1 + take_profit) times its initial balance. All paths advance together one round at a time as NumPy
+    arrays. Draws depend only on the seed, so settings compared with the same simulator see the same rounds.
+
+    Without consistent betting, bets are computed for all paths at once from the strategy's percentages. If the
+    strategy overrides calculate_bet_amount_for_box_one or _two, that method is called once per path and round
+    instead, which gives the right stakes but is much slower.
+    """
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+    strategy: BettingStrategy
+    data_source: DataSource
+    targets: np.ndarray
+    initial_balance: float
+    paths: int = 20_000
+    rounds: int = 2_000
+    consistent: bool = True
+    seed: int = 0
+
+    def bet_amounts(self, box: int, balances: np.ndarray) -> np.ndarray:
+        """Returns the bet for one box at each balance, sized by the strategy as in Backtester.run."""
+        name = ('calculate_bet_amount_for_box_one', 'calculate_bet_amount_for_box_two')[box]
+        if getattr(type(self.strategy), name) is getattr(BettingStrategy, name):
+            percentage = (self.strategy.percentage_to_bet_per_round_for_box_one, self.strategy.percentage_to_bet_per_round_for_box_two)[box]
+            bet_amounts = np.round(balances * percentage, 2)
+        else:
+            calculate_bet_amount = getattr(self.strategy, name)
+            bet_amounts = np.fromiter((calculate_bet_amount(balance=float(balance)) for balance in balances), dtype=np.float64, count=len(balances))
+        return np.maximum(bet_amounts, MINIMUM_BET_AMOUNT)
+
+    def simulate(self, risk_manager: RiskManager) -> dict:
+        """
+        Simulates every path until it stops or runs out of rounds.
+        :return: Per-path arrays: the outcome (OPEN, STOP_LOSS or TAKE_PROFIT), the number of rounds played,
+        the final balance and the largest drawdown as a fraction of the highest balance.
+        """
+        rng = np.random.default_rng(self.seed)
+        multipliers = self.data_source.data['multiplier'].to_numpy()
+        targets = np.asarray(self.targets, dtype=np.float64).reshape(-1, 2)
+        balances = np.full(self.paths, float(self.initial_balance))
+        peaks = balances.copy()
+        max_drawdowns = np.zeros(self.paths)
+        outcomes = np.full(self.paths, OPEN, dtype=np.int8)
+        rounds_played = np.full(self.paths, self.rounds, dtype=np.int64)
+        active = np.ones(self.paths, dtype=bool)
+        take_profit_amount = self.initial_balance + (self.initial_balance * risk_manager.take_profit)
+        if self.consistent:
+            consistent_bet_amounts = [self.bet_amounts(box, np.array([float(self.initial_balance)]))[0] for box in range(2)]
+        for t in range(self.rounds):
+            peaks = np.maximum(peaks, balances)
+            stopped = active & (balances <= peaks - (peaks * risk_manager.stop_loss))
+            took_profit = active & ~stopped & (balances >= take_profit_amount)
+            outcomes[stopped] = STOP_LOSS
+            outcomes[took_profit] = TAKE_PROFIT
+            rounds_played[stopped | took_profit] = t
+            active &= ~(stopped | took_profit)
+            if not active.any():
+                break
+            crashed_at = multipliers[rng.integers(len(multipliers), size=self.paths)]
+            decided = targets[rng.integers(len(targets), size=self.paths)]
+            profits = np.zeros(self.paths)
+            for box in range(2):
+                bet_amounts = consistent_bet_amounts[box] if self.consistent else self.bet_amounts(box, balances)
+                profits += np.where(
+                    decided[:, box] > 1.0,
+                    np.where(decided[:, box] <= crashed_at, bet_amounts * (decided[:, box] - 1.0), -bet_amounts),
+                    0.0,
+                )
+            balances = np.where(active, balances + profits, balances)
+            max_drawdowns = np.maximum(max_drawdowns, (peaks - balances) / peaks)
+        return {
+            'outcome': outcomes,
+            'rounds': rounds_played,
+            'final_balance': balances,
+            'max_drawdown': max_drawdowns,
+        }
+
+    def summarize(self, risk_manager: RiskManager, simulation: dict, round_seconds: float) -> dict:
+        """Reduces a simulation to ruin and take-profit probabilities and quantiles of time to take profit and drawdown."""
+        take_profit_rounds = simulation['rounds'][simulation['outcome'] == TAKE_PROFIT]
+        summary = {
+            'stop_loss': risk_manager.stop_loss,
+            'take_profit': risk_manager.take_profit,
+            'ruin_probability': float(np.mean(simulation['outcome'] == STOP_LOSS)),
+            'take_profit_probability': float(np.mean(simulation['outcome'] == TAKE_PROFIT)),
+            'open_probability': float(np.mean(simulation['outcome'] == OPEN)),
+            'mean_final_balance': round(float(simulation['final_balance'].mean()), 2),
+        }
+        for quantile in QUANTILES:
+            label = f'p{round(quantile * 100)}'
+            rounds_to_take_profit = float(np.quantile(take_profit_rounds, quantile)) if len(take_profit_rounds) else None
+            summary[f'take_profit_seconds_{label}'] = rounds_to_take_profit * round_seconds if rounds_to_take_profit is not None else None
+            summary[f'max_drawdown_{label}'] = round(float(np.quantile(simulation['max_drawdown'], quantile)), 4)
+        return summary
+
+    def run(self, risk_managers: list[RiskManager]) -> pl.DataFrame:
+        """Simulates every risk manager setting on the same draws and returns one row per setting."""
+        round_seconds = seconds_per_round(self.data_source.data)
+        results = []
+        for risk_manager in risk_managers:
+            start = time.perf_counter()
+            simulation = self.simulate(risk_manager)
+            results.append({
+                **self.summarize(risk_manager, simulation, round_seconds),
+                'simulation_seconds': round(time.perf_counter() - start, 3),
+            })
+        return pl.DataFrame(results)
+
+
+if __name__ == '__main__':
+    # Usage: python -m bot.backtesting.monte_carlo strategy_module start_date [paths] [rounds]
+    from bot.backtesting.backtest import Backtester
+    module = importlib.import_module(sys.argv[1])
+    backtester = Backtester(
+        strategy=module.strategy.model_copy(deep=True),
+        risk_manager=module.risk_manager.model_copy(deep=True),
+        data_source=module.data_source,
+        start_date=sys.argv[2],
+        initial_balance=20000,
+    )
+    backtester.run()
+    simulator = RiskOfRuinSimulator(
+        strategy=module.strategy,
+        data_source=module.data_source,
+        targets=decided_targets(backtester.bet_history),
+        initial_balance=20000,
+        paths=int(sys.argv[3]) if len(sys.argv) > 3 else 20_000,
+        rounds=int(sys.argv[4]) if len(sys.argv) > 4 else 2_000,
+    )
+    settings = dict.fromkeys(
+        (stop_loss, take_profit)
+        for stop_loss in (module.risk_manager.stop_loss, 0.05, 0.1, 0.25)
+        for take_profit in (module.risk_manager.take_profit, 0.05, 0.1, 0.3)
+    )
+    with pl.Config(tbl_rows=-1, tbl_cols=-1):
+        print(simulator.run([RiskManager(stop_loss=stop_loss, take_profit=take_profit) for stop_loss, take_profit in settings]))
@@ -0,0 +1,149 @@
+import io
+import os
+import sys
+import json
+import inspect
+from hashlib import sha256
+from functools import cache
+from datetime import datetime, timedelta
+
+from pydantic import BaseModel
+import polars as pl
+
+
+RUNTIME_FIELDS = {'is_backtest', 'log', 'statistics', 'clock', 'indicators', 'balance_for_stop_loss'}
+BACKTEST_OPTIONS = [
+    'start_date', 'end_date', 'look_back', 'start_time', 'end_time', 'initial_balance',
+    'consistent', 'continuous', 'iteration_wait_rounds', 'vectorized',
+]
+FINGERPRINT_COLUMNS = ['date', 'time', 'multiplier']
+
+
+def model_settings(model: BaseModel) -> dict:
+    """
+    Returns the field values that configure a strategy or risk manager. Fields the engine sets at run time are left
+    out, as are fields declared with Field(exclude=True), which strategies use for helper state such as a lazily built
+    tracker. Any other field must serialize to JSON.
+    """
+    return model.model_dump(mode='json', exclude=RUNTIME_FIELDS)
+
+
+def module_source(obj) -> str:
+    """Returns the source of the module an object is defined in, or an empty string when it is not available."""
+    module = sys.modules.get(getattr(obj, '__module__', None))
+    try:
+        return inspect.getsource(module) if module is not None else ''
+    except (OSError, TypeError):
+        return ''
+
+
+@cache
+def package_source() -> str:
+    """Hashes the source of every module in the bot package, which the strategy, risk manager and engine run on."""
+    digest = sha256()
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    for directory, directories, files in os.walk(root):
+        directories.sort()
+        for name in sorted(files):
+            if name.endswith('.py'):
+                path = os.path.join(directory, name)
+                digest.update(os.path.relpath(path, root).encode())
+                with open(path, 'rb') as f:
+                    digest.update(f.read())
+    return digest.hexdigest()
+
+
+def frame_fingerprint(frame: pl.DataFrame) -> str:
+    """Hashes the dates, times and multipliers of a slice of rounds as an uncompressed Arrow IPC stream."""
+    buffer = io.BytesIO()
+    frame.select(FINGERPRINT_COLUMNS).write_ipc_stream(buffer, compression='uncompressed')
+    return sha256(buffer.getvalue()).hexdigest()
+
+
+class BacktestResultCache:
+    """
+    Persistent cache of backtest results, so re-running an unchanged backtest or sweep configuration returns
+    the stored iteration history and summary instead of simulating the rounds again.
+
+    A run is keyed by the sha256 of the strategy's settings, the risk manager's settings, the Backtester options,
+    the source of the strategy's module and of the whole bot package, and a fingerprint of the rounds the
+    strategy sees, including its look-back days. Each entry is one JSON file in the cache directory. Hits refresh
+    the file's mtime, and once the entries take more than max_bytes the least recently used ones are removed.
+    Bet histories are not stored.
+    """
+    def __init__(self, directory: str = 'data/backtest_cache', max_bytes: int = 256 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    def key(self, backtester) -> str:
+        if backtester.replays_live_bet_history:
+            rounds = backtester.get_historical_data()
+        else:
+            if not backtester.data_source.indexed:
+                backtester.data_source.build_index()
+            look_back_date = datetime.strptime(backtester.start_date, '%Y-%m-%d') - timedelta(days=backtester.look_back)
+            rounds = backtester.data_source.get_data_by_date_and_time(
+                start_date=look_back_date.strftime('%Y-%m-%d'),
+                end_date=backtester.end_date or backtester.start_date,
+                start_time=backtester.start_time,
+                end_time=backtester.end_time,
+            )
+        content = {
+            'strategy': type(backtester.strategy).__qualname__,
+            'strategy_settings': model_settings(backtester.strategy),
+            'risk_manager_settings': model_settings(backtester.risk_manager),
+            'backtest_options': {name: getattr(backtester, name) for name in BACKTEST_OPTIONS},
+            'strategy_source': sha256(module_source(type(backtester.strategy)).encode()).hexdigest(),
+            'engine_source': package_source(),
+            'rounds': frame_fingerprint(rounds),
+        }
+        return sha256(json.dumps(content, sort_keys=True, default=str).encode()).hexdigest()
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.directory, f'{key}.json')
+
+    def get(self, key: str) -> dict | None:
+        """Returns the stored result for the key, or None on a miss."""
+        path = self.path(key)
+        try:
+            with open(path) as f:
+                result = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        os.utime(path)
+        return result
+
+    def put(self, key: str, result: dict) -> None:
+        path = self.path(key)
+        temporary_path = f'{path}.{os.getpid()}.tmp'
+        with open(temporary_path, 'w') as f:
+            json.dump(result, f)
+        os.replace(temporary_path, path)
+        self.evict()
+
+    def evict(self) -> None:
+        """
+        Removes the least recently used entries until the rest fit in max_bytes. Entries another process removes
+        in the meantime are skipped.
+        """
+        entries = []
+        for entry in os.scandir(self.directory):
+            if not entry.name.endswith('.json'):
+                continue
+            try:
+                entries.append((entry, entry.stat()))
+            except FileNotFoundError:
+                continue
+        total_bytes = sum(stat.st_size for _, stat in entries)
+        if total_bytes <= self.max_bytes:
+            return
+        entries.sort(key=lambda entry: entry[1].st_mtime_ns)
+        for entry, stat in entries:
+            if total_bytes <= self.max_bytes:
+                break
+            try:
+                os.remove(entry.path)
+            except FileNotFoundError:
+                pass
+            total_bytes -= stat.st_size
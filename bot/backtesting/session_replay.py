@@ -0,0 +1,131 @@
+import os
+import glob
+import logging
+import multiprocessing
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+from pydantic import BaseModel, ConfigDict
+import polars as pl
+
+from bot.strategy import BettingStrategy, RiskManager
+from bot.data_source import DataSource, read_live_bet_history
+from bot.backtesting.backtest import Backtester
+from bot.backtesting.sweep import write_shared_frame, map_shared_frame
+
+
+SESSION_PATTERNS = ['live_bet_history/*.json', 'live_bet_history/*.jsonl']
+SESSION_SCHEMA = {
+    'session': pl.String,
+    'date': pl.String,
+    'time': pl.String,
+    'multiplier': pl.Float64,
+    'initial_balance': pl.Float64,
+}
+
+_worker: dict = {}
+
+
+def load_sessions(patterns: list[str] = SESSION_PATTERNS) -> pl.DataFrame:
+    """
+    Reads every live bet history file matching one of the patterns into one frame, with a session column naming
+    the file. Empty files are left out and unreadable files are skipped with a logged warning. Without any sessions,
+    the frame is empty.
+    """
+    sessions = []
+    for session_file in sorted({session_file for pattern in patterns for session_file in glob.glob(pattern)}):
+        try:
+            session = read_live_bet_history(session_file)
+        except Exception as e:
+            logging.warning(f'Skipping {session_file}: {e}')
+            continue
+        if session.is_empty():
+            continue
+        sessions.append(session.select(
+            pl.lit(os.path.basename(session_file)).alias('session'),
+            pl.col('date').cast(pl.String),
+            pl.col('time').cast(pl.String),
+            pl.col('multiplier').cast(pl.Float64),
+            pl.col('initial_balance').cast(pl.Float64),
+        ))
+    if not sessions:
+        return pl.DataFrame(schema=SESSION_SCHEMA)
+    return pl.concat(sessions)
+
+
+def _initialize_worker(frame_file: str, strategy: BettingStrategy, risk_manager: RiskManager, backtest_parameters: dict) -> None:
+    logging.disable(logging.INFO)
+    _worker['sessions'] = map_shared_frame(frame_file)
+    strategy.log = risk_manager.log = None
+    _worker['strategy'] = strategy
+    _worker['risk_manager'] = risk_manager
+    _worker['backtest_parameters'] = backtest_parameters
+
+
+def _replay_session(session: tuple[str, int, int]) -> dict:
+    name, offset, length = session
+    rounds = _worker['sessions'].slice(offset, length)
+    backtest_parameters = {
+        'start_date': rounds['date'][0],
+        'initial_balance': rounds['initial_balance'][0],
+        **_worker['backtest_parameters'],
+    }
+    backtester = Backtester(
+        strategy=_worker['strategy'].model_copy(deep=True),
+        risk_manager=_worker['risk_manager'].model_copy(deep=True),
+        data_source=DataSource.from_frame(rounds),
+        live_bet_history=rounds,
+        **backtest_parameters,
+    )
+    backtester.run()
+    return {'session': name, 'date': rounds['date'][0], **backtester.get_summary()}
+
+
+class SessionReplay(BaseModel):
+    """
+    Replays a strategy against every recorded live bet history session, one session per worker process.
+    The sessions are read once and shared with the workers through a memory-mapped Arrow IPC file.
+    Unless backtest_parameters sets initial_balance, each session starts from the balance it was recorded with.
+    """
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+    strategy: BettingStrategy
+    risk_manager: RiskManager
+    patterns: list[str] = SESSION_PATTERNS
+    backtest_parameters: dict = {}
+    max_workers: int = None
+
+    def run(self) -> pl.DataFrame:
+        """Replays every session and returns one row of results per session."""
+        rounds = load_sessions(self.patterns)
+        if rounds.is_empty():
+            raise ValueError(f'No live bet history sessions match {self.patterns}')
+        sessions = rounds.with_row_index('offset').group_by('session', maintain_order=True).agg(
+            pl.col('offset').first(),
+            pl.len().alias('length'),
+        )
+        with tempfile.TemporaryDirectory() as directory:
+            frame_file = write_shared_frame(rounds, directory)
+            with ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_initialize_worker,
+                initargs=(frame_file, self.strategy, self.risk_manager, self.backtest_parameters),
+            ) as executor:
+                results = list(executor.map(_replay_session, sessions.iter_rows(), chunksize=8))
+        return pl.DataFrame(results)
+
+    @staticmethod
+    def summarize(results: pl.DataFrame) -> pl.DataFrame:
+        """Aggregates the per-session results into a single row."""
+        return results.select(
+            pl.len().alias('sessions'),
+            (pl.col('net_profit') > 0).sum().alias('profitable_sessions'),
+            pl.col('rounds').sum(),
+            pl.col('net_profit').sum().round(2),
+            pl.col('net_profit').mean().round(2).alias('mean_net_profit'),
+            pl.col('net_profit').min().alias('worst_net_profit'),
+            pl.col('wins').sum(),
+            pl.col('losses').sum(),
+            pl.col('max_drawdown').max(),
+            pl.col('max_drawdown_percentage').max(),
+        )
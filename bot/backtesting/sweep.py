@@ -0,0 +1,161 @@
+import os
+import sys
+import logging
+import itertools
+import multiprocessing
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+from pydantic import BaseModel, ConfigDict
+import polars as pl
+import pyarrow as pa
+
+from bot.strategy import BettingStrategy, RiskManager
+from bot.data_source import DataSource
+from bot.backtesting.backtest import Backtester
+
+
+_worker: dict = {}
+
+
+def write_shared_frame(frame: pl.DataFrame, directory: str) -> str:
+    """Writes a frame as an uncompressed Arrow IPC file that worker processes can memory-map."""
+    frame_file = os.path.join(directory, 'rounds.arrow')
+    frame.write_ipc(frame_file, compression='uncompressed')
+    return frame_file
+
+
+def map_shared_frame(frame_file: str) -> pl.DataFrame:
+    """Memory-maps a frame written by write_shared_frame without copying its buffers."""
+    return pl.from_arrow(pa.ipc.open_file(pa.memory_map(frame_file)).read_all(), rechunk=False)
+
+
+def _initialize_worker(frame_file: str, strategy: BettingStrategy, risk_manager: RiskManager, backtest_parameters: dict) -> None:
+    """Maps the shared rounds into the worker once and keeps the templates every configuration is copied from."""
+    logging.disable(logging.INFO)
+    _worker['data_source'] = DataSource.from_frame(map_shared_frame(frame_file), indexed=True)
+    strategy.log = risk_manager.log = None
+    _worker['strategy'] = strategy
+    _worker['risk_manager'] = risk_manager
+    _worker['backtest_parameters'] = backtest_parameters
+
+
+def _run_configuration(configuration: dict) -> dict:
+    strategy = _worker['strategy'].model_copy(deep=True)
+    risk_manager = _worker['risk_manager'].model_copy(deep=True)
+    backtest_parameters = dict(_worker['backtest_parameters'])
+    for name, value in configuration.items():
+        if name in type(strategy).model_fields:
+            setattr(strategy, name, value)
+        elif name in RiskManager.model_fields:
+            setattr(risk_manager, name, value)
+        else:
+            backtest_parameters[name] = value
+    backtester = Backtester(
+        strategy=strategy,
+        risk_manager=risk_manager,
+        data_source=_worker['data_source'],
+        **backtest_parameters,
+    )
+    backtester.run()
+    return {**configuration, **backtester.get_summary()}
+
+
+class ParameterSweep(BaseModel):
+    """
+    Backtests every combination of a parameter grid across a process pool.
+    Grid keys name a field of the strategy, of the risk manager, or a Backtester argument, in that order.
+    The rounds are written once to an uncompressed Arrow IPC file that every worker memory-maps read-only.
+    Workers are spawned rather than forked, since forking after Polars has started its thread pool can deadlock.
+    """
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+    strategy: BettingStrategy
+    risk_manager: RiskManager
+    data_source: DataSource
+    parameter_grid: dict[str, list]
+    backtest_parameters: dict = {}
+    max_workers: int = None
+
+    def configurations(self) -> list[dict]:
+        names = list(self.parameter_grid)
+        return [dict(zip(names, values)) for values in itertools.product(*self.parameter_grid.values())]
+
+    def _validate_grid(self) -> None:
+        """Raises a ValueError naming the grid keys that are not a strategy, risk manager or Backtester field."""
+        known_fields = set(type(self.strategy).model_fields) | set(RiskManager.model_fields) | set(Backtester.model_fields)
+        unknown_fields = [name for name in self.parameter_grid if name not in known_fields]
+        if unknown_fields:
+            raise ValueError(f'Unknown {type(self).__name__} parameters: {unknown_fields}')
+
+    def run(self) -> pl.DataFrame:
+        """Runs every configuration and returns one row per configuration, best net profit first."""
+        self._validate_grid()
+        if not self.data_source.indexed:
+            self.data_source.build_index()
+        configurations = self.configurations()
+        with tempfile.TemporaryDirectory() as directory:
+            frame_file = write_shared_frame(self.data_source.data, directory)
+            with ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_initialize_worker,
+                initargs=(frame_file, self.strategy, self.risk_manager, self.backtest_parameters),
+            ) as executor:
+                results = list(executor.map(_run_configuration, configurations))
+        return pl.DataFrame(results).sort('net_profit', descending=True, maintain_order=True)
+
+
+def lazy_data_source(module_name: str, csv_file: str):
+    """
+    Returns a module __getattr__ for a strategy script that loads its data_source from csv_file on first use.
+    Sweep and walk-forward workers re-run the script to unpickle the strategy, and only need the rounds shared
+    with them, not the CSV. Use it as __getattr__ = lazy_data_source(__name__, 'rounds.csv').
+    """
+    def __getattr__(name: str):
+        if name == 'data_source':
+            module = sys.modules[module_name]
+            module.data_source = DataSource(csv_file=csv_file)
+            return module.data_source
+        raise AttributeError(f'module {module_name!r} has no attribute {name!r}')
+    return __getattr__
+
+
+def run_sweep_command(
+    command: str,
+    strategy: BettingStrategy,
+    risk_manager: RiskManager,
+    data_source: DataSource,
+    parameter_grid: dict[str, list],
+    backtest_parameters: dict,
+    **walk_forward_parameters,
+) -> None:
+    """
+    Runs the sweep or walk-forward command of a strategy script over the parameter grid and prints the results.
+    The walk-forward command cuts its own dates, so it drops start_date and end_date from backtest_parameters and
+    takes its window settings from walk_forward_parameters.
+    """
+    from bot.backtesting.walk_forward import WalkForward
+    if command == 'sweep':
+        sweep = ParameterSweep(
+            strategy=strategy,
+            risk_manager=risk_manager,
+            data_source=data_source,
+            parameter_grid=parameter_grid,
+            backtest_parameters=backtest_parameters,
+        )
+    elif command == 'walk-forward':
+        sweep = WalkForward(
+            strategy=strategy,
+            risk_manager=risk_manager,
+            data_source=data_source,
+            parameter_grid=parameter_grid,
+            backtest_parameters={name: value for name, value in backtest_parameters.items() if name not in ('start_date', 'end_date')},
+            **walk_forward_parameters,
+        )
+    else:
+        raise ValueError(f'Unknown command: {command}')
+    results = sweep.run()
+    with pl.Config(tbl_rows=-1, tbl_cols=-1):
+        print(results)
+        if isinstance(sweep, WalkForward):
+            print(sweep.summarize(results))
@@ -0,0 +1,71 @@
+from datetime import datetime
+
+import numpy as np
+import polars as pl
+import pytest
+
+from bot.backtesting.backtest import Backtester
+from bot.data_source import DataSource, DecidedMultiplier
+from bot.strategy import BettingStrategy, RiskManager
+from bot.utils.generate_rounds import generate_chunk
+
+
+class ScheduledStrategy(BettingStrategy):
+    """
+    Bets the multipliers of a fixed schedule, so both engine modes see the same decisions. Its percentages keep
+    every bet at the minimum amount, where payouts are whole cents and the two modes round alike.
+    """
+    model_config = {'arbitrary_types_allowed': True}
+    box_one: np.ndarray
+    box_two: np.ndarray
+
+    def decide_multiplier(self, game_data, bet_history=[], restart_strategy=False) -> DecidedMultiplier:
+        return DecidedMultiplier(
+            multiplier_for_box_one=float(self.box_one[len(bet_history)]),
+            multiplier_for_box_two=float(self.box_two[len(bet_history)]),
+        )
+
+    def decide_multipliers(self, game_data: pl.DataFrame) -> tuple[np.ndarray, np.ndarray]:
+        return self.box_one, self.box_two
+
+
+def run(data: pl.DataFrame, box_one: np.ndarray, box_two: np.ndarray, vectorized: bool, **options) -> Backtester:
+    backtester = Backtester(
+        strategy=ScheduledStrategy(
+            percentage_to_bet_per_round_for_box_one=0.0001,
+            percentage_to_bet_per_round_for_box_two=0.0001,
+            box_one=box_one,
+            box_two=box_two,
+        ),
+        risk_manager=RiskManager(stop_loss=0.01, take_profit=0.01),
+        data_source=DataSource.from_frame(data),
+        start_date=data['date'][0],
+        initial_balance=20000,
+        vectorized=vectorized,
+        **options,
+    )
+    backtester.run()
+    return backtester
+
+
+@pytest.mark.parametrize('seed', range(5))
+@pytest.mark.parametrize('options', [
+    {},
+    {'continuous': False},
+    {'iteration_wait_rounds': 3},
+    {'consistent': False},
+    {'consistent': False, 'continuous': False, 'iteration_wait_rounds': 3},
+])
+def test_vectorized_summary_matches_round_loop(seed, options):
+    data = generate_chunk(1, 2000, f'vectorized-{seed}', datetime(2025, 1, 1), 1, 0.03, None)
+    rng = np.random.default_rng(seed)
+    box_one = np.where(rng.random(len(data)) < 0.7, rng.choice([1.5, 2.0, 3.0], len(data)), 1.0)
+    box_two = np.where(rng.random(len(data)) < 0.5, rng.choice([1.2, 5.0], len(data)), 1.0)
+    loop = run(data, box_one, box_two, vectorized=False, **options)
+    vectorized = run(data, box_one, box_two, vectorized=True, **options)
+    assert vectorized.statistics.box_one == loop.statistics.box_one
+    assert vectorized.statistics.box_two == loop.statistics.box_two
+    loop_summary, vectorized_summary = loop.get_summary(), vectorized.get_summary()
+    assert loop_summary.keys() == vectorized_summary.keys()
+    for name in loop_summary:
+        assert vectorized_summary[name] == pytest.approx(loop_summary[name]), name
@@ -0,0 +1,237 @@
+import numpy as np
+import polars as pl
+
+from bot.data_source import IterationHistory, BetStatistics, BoxStatistics
+from bot.data_source.bet_history_store import RESULT_CODES
+from bot.data_source.categorizer import category_expression
+
+
+WIN, LOSS, DRAW, MISS = range(len(RESULT_CODES))
+
+MINIMUM_BET_AMOUNT = 10.00
+INITIAL_CHUNK_SIZE = 256
+
+
+def round_results(multipliers: np.ndarray, decided: np.ndarray) -> np.ndarray:
+    """
+    Encodes the result of every round for one box, using the same rules as Backtester.run.
+    :param multipliers: Multipliers the rounds crashed at.
+    :param decided: Multipliers the strategy decided to cash out at.
+    :return: Array of indexes into RESULT_CODES.
+    """
+    results = np.where((decided > 1.0) & (decided <= multipliers), WIN, LOSS)
+    return np.where(decided == 1.0, DRAW, results).astype(np.int8)
+
+
+def round_profits_in_cents(multipliers: np.ndarray, box_one: np.ndarray, box_two: np.ndarray, bet_amount_for_box_one, bet_amount_for_box_two) -> np.ndarray:
+    """
+    Computes the balance change of every round in whole cents.
+    Bet amounts can be scalars (consistent betting) or arrays aligned with the rounds.
+    """
+    profit = np.where(box_one > 1.0, np.where(box_one <= multipliers, bet_amount_for_box_one * (box_one - 1.0), -bet_amount_for_box_one), 0.0)
+    profit = profit + np.where(box_two > 1.0, np.where(box_two <= multipliers, bet_amount_for_box_two * (box_two - 1.0), -bet_amount_for_box_two), 0.0)
+    return np.floor(profit * 100 + 0.5 + 1e-9).astype(np.int64)
+
+
+def iteration_record(initial_balance: float, current_balance: float, iteration: int) -> IterationHistory:
+    profit = (current_balance - initial_balance) if current_balance > initial_balance else 0.0
+    loss = (initial_balance - current_balance) if initial_balance > current_balance else 0.0
+    profit_percentage = (profit / initial_balance) * 100 if profit > 0 else 0.0
+    loss_percentage = (loss / initial_balance) * 100 if loss > 0 else 0.0
+    return IterationHistory(
+        profit=profit,
+        loss=loss,
+        iteration=iteration,
+        profit_percentage=profit_percentage,
+        loss_percentage=loss_percentage
+    )
+
+
+def simulate_rounds(
+    multipliers: np.ndarray,
+    box_one: np.ndarray,
+    box_two: np.ndarray,
+    initial_balance: float,
+    calculate_bet_amount_for_box_one,
+    calculate_bet_amount_for_box_two,
+    stop_loss: float,
+    take_profit: float,
+    consistent: bool = True,
+    continuous: bool = True,
+    iteration_wait_rounds: int = 0,
+) -> dict:
+    """
+    Replays a sequence of decided multipliers against the rounds they were made for.
+
+    Balance paths are computed one risk-manager iteration at a time: inside an iteration the bet
+    amounts are fixed (when consistent), so the balance is a cumulative sum and the round that
+    trips the stop loss or take profit is found with a single array search. With consistent=False
+    the bet amount follows the balance, so the search advances one round at a time.
+
+    Balances are kept in whole cents and each round's payout is rounded half up, where Backtester.run
+    rounds a running float; the two agree except on half-cent payouts, which can differ by a cent.
+
+    :return: Per-round columns for the bet history, the iteration history and the final balances.
+    """
+    n = len(multipliers)
+    recorded_one = np.ones(n)
+    recorded_two = np.ones(n)
+    bet_amounts_one = np.zeros(n)
+    bet_amounts_two = np.zeros(n)
+    initial_balances = np.zeros(n)
+    current_balances = np.zeros(n)
+    betting = np.zeros(n, dtype=bool)
+    iteration_history: list[IterationHistory] = []
+
+    balance_in_cents = int(round(initial_balance * 100))
+    iteration_initial_balance = balance_in_cents / 100
+    balance_for_stop_loss = iteration_initial_balance
+    bet_amount_for_box_one = bet_amount_for_box_two = 0.0
+    iteration = 1
+    wait = 0
+    t = 0
+
+    def passes(balance: float) -> bool:
+        stop_loss_amount = balance_for_stop_loss - (balance_for_stop_loss * stop_loss)
+        take_profit_amount = iteration_initial_balance + (iteration_initial_balance * take_profit)
+        return stop_loss_amount < balance < take_profit_amount
+
+    while t < n:
+        balance = balance_in_cents / 100
+        balance_for_stop_loss = max(balance_for_stop_loss, balance)
+        if not passes(balance) and continuous:
+            iteration_history.append(iteration_record(iteration_initial_balance, balance, iteration))
+            iteration_initial_balance = balance
+            balance_for_stop_loss = balance
+            iteration += 1
+            wait = iteration_wait_rounds
+
+        if not passes(balance) or wait > 0:
+            wait -= 1
+            bet_amounts_one[t] = bet_amount_for_box_one
+            bet_amounts_two[t] = bet_amount_for_box_two
+            initial_balances[t] = iteration_initial_balance
+            current_balances[t] = balance
+            t += 1
+            continue
+
+        bet_balance = iteration_initial_balance if consistent else balance
+        bet_amount_for_box_one = max(calculate_bet_amount_for_box_one(balance=bet_balance), MINIMUM_BET_AMOUNT)
+        bet_amount_for_box_two = max(calculate_bet_amount_for_box_two(balance=bet_balance), MINIMUM_BET_AMOUNT)
+
+        chunk = INITIAL_CHUNK_SIZE if consistent else 1
+        while True:
+            end = min(t + chunk, n)
+            profits = round_profits_in_cents(multipliers[t:end], box_one[t:end], box_two[t:end], bet_amount_for_box_one, bet_amount_for_box_two)
+            # balances[k] is the balance after round t + k, i.e. the balance checked before round t + k + 1
+            balances = (balance_in_cents + np.cumsum(profits)) / 100
+            peaks = np.maximum(np.maximum.accumulate(balances), balance_for_stop_loss)
+            failed = (balances <= peaks - (peaks * stop_loss)) | (balances >= iteration_initial_balance + (iteration_initial_balance * take_profit))
+            failed[-1] = failed[-1] or end == n or not consistent
+            if failed.any() or end == n:
+                length = int(np.argmax(failed)) + 1
+                break
+            chunk *= 2
+
+        segment = slice(t, t + length)
+        recorded_one[segment] = box_one[segment]
+        recorded_two[segment] = box_two[segment]
+        bet_amounts_one[segment] = bet_amount_for_box_one
+        bet_amounts_two[segment] = bet_amount_for_box_two
+        initial_balances[segment] = iteration_initial_balance
+        current_balances[segment] = balances[:length]
+        betting[segment] = True
+        balance_in_cents = balance_in_cents + int(profits[:length].sum())
+        if length > 1:
+            balance_for_stop_loss = max(balance_for_stop_loss, float(balances[:length - 1].max()))
+        t += length
+
+    final_balance = balance_in_cents / 100
+    if not continuous:
+        iteration_history.append(iteration_record(iteration_initial_balance, final_balance, iteration))
+
+    return {
+        'multiplier_for_box_one': recorded_one,
+        'multiplier_for_box_two': recorded_two,
+        'bet_amount_for_box_one': bet_amounts_one,
+        'bet_amount_for_box_two': bet_amounts_two,
+        'result_one': np.where(betting, round_results(multipliers, recorded_one), DRAW).astype(np.int8),
+        'result_two': np.where(betting, round_results(multipliers, recorded_two), DRAW).astype(np.int8),
+        'initial_balance': initial_balances,
+        'current_balance': current_balances,
+        'iteration_history': iteration_history,
+        'final_initial_balance': iteration_initial_balance,
+        'final_balance': final_balance,
+        'balance_for_stop_loss': balance_for_stop_loss,
+    }
+
+
+def streaks(flags: np.ndarray) -> tuple[int, int]:
+    """Returns the longest run of True values and the run of True values the array ends with."""
+    if not flags.any():
+        return 0, 0
+    edges = np.diff(np.concatenate(([0], flags.astype(np.int8), [0])))
+    starts, ends = np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+    return int((ends - starts).max()), int(ends[-1] - starts[-1]) if flags[-1] else 0
+
+
+def box_statistics(results: np.ndarray) -> BoxStatistics:
+    """Counts one box's results the way BoxStatistics.update does, round by round."""
+    settled = results[results != DRAW]
+    longest_win_streak, win_streak = streaks(settled == WIN)
+    longest_loss_streak, loss_streak = streaks(settled != WIN)
+    return BoxStatistics(
+        wins=int((results == WIN).sum()),
+        losses=int((results == LOSS).sum()),
+        misses=int((results == MISS).sum()),
+        draws=int((results == DRAW).sum()),
+        win_streak=win_streak,
+        loss_streak=loss_streak,
+        longest_win_streak=longest_win_streak,
+        longest_loss_streak=longest_loss_streak,
+    )
+
+
+def simulated_statistics(simulation: dict) -> BetStatistics:
+    """Builds the BetStatistics that updating it with every simulated round would give."""
+    rounds = len(simulation['current_balance'])
+    if not rounds:
+        return BetStatistics()
+    starting_balance = float(simulation['initial_balance'][0])
+    balances = simulation['current_balance']
+    peaks = np.maximum.accumulate(np.maximum(balances, starting_balance))
+    drawdowns = np.round(peaks - balances, 2)
+    worst = int(np.argmax(drawdowns))
+    max_drawdown = float(drawdowns[worst]) if drawdowns[worst] > 0 else 0.0
+    return BetStatistics(
+        rounds=rounds,
+        box_one=box_statistics(simulation['result_one']),
+        box_two=box_statistics(simulation['result_two']),
+        starting_balance=starting_balance,
+        current_balance=float(balances[-1]),
+        peak_balance=float(peaks[-1]),
+        max_drawdown=max_drawdown,
+        max_drawdown_percentage=(max_drawdown / float(peaks[worst])) * 100 if max_drawdown and peaks[worst] > 0 else 0.0,
+    )
+
+
+def bet_history_frame(historical_data: pl.DataFrame, simulation: dict) -> pl.DataFrame:
+    """Lays the simulated rounds out with the same columns as BetHistory."""
+    return pl.DataFrame({
+        'round_number': historical_data['game_round'],
+        'date': historical_data['date'],
+        'time': historical_data['time'],
+        'bet_amount_for_box_one': simulation['bet_amount_for_box_one'],
+        'bet_amount_for_box_two': simulation['bet_amount_for_box_two'],
+        'multiplier': historical_data['multiplier'],
+        'multiplier_for_box_one': simulation['multiplier_for_box_one'],
+        'multiplier_for_box_two': simulation['multiplier_for_box_two'],
+        'result_one': simulation['result_one'],
+        'result_two': simulation['result_two'],
+        'initial_balance': simulation['initial_balance'],
+        'current_balance': simulation['current_balance'],
+    }).with_columns(
+        category_expression('multiplier').alias('multiplier_category'),
+        category_expression('multiplier_for_box_one').alias('decided_multiplier_one_category'),
+        category_expression('multiplier_for_box_two').alias('decided_multiplier_two_category'),
+    )
@@ -0,0 +1,97 @@
+import multiprocessing
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+import polars as pl
+
+from bot.backtesting.sweep import ParameterSweep, write_shared_frame, _initialize_worker, _run_configuration
+
+
+def _run_window(window: dict) -> dict:
+    """Backtests every configuration on the train dates of a window, then the best one on its test dates."""
+    train_results = [
+        _run_configuration({**configuration, 'start_date': window['train_start'], 'end_date': window['train_end']})
+        for configuration in window['configurations']
+    ]
+    choose = max if window['maximize'] else min
+    best = choose(train_results, key=lambda result: result[window['objective']])
+    parameters = {name: best[name] for name in window['configurations'][0]}
+    test_result = _run_configuration({**parameters, 'start_date': window['test_start'], 'end_date': window['test_end']})
+    return {
+        'window': window['window'],
+        'train_start': window['train_start'],
+        'train_end': window['train_end'],
+        'test_start': window['test_start'],
+        'test_end': window['test_end'],
+        **parameters,
+        f'train_{window["objective"]}': best[window['objective']],
+        **{f'test_{name}': value for name, value in test_result.items() if name not in parameters and name not in ('start_date', 'end_date')},
+    }
+
+
+class WalkForward(ParameterSweep):
+    """
+    Walk-forward optimization over rolling windows of recorded dates.
+    Each window tunes the parameter grid on train_days dates, keeping the configuration with the highest objective,
+    or the lowest with maximize=False for objectives such as max_drawdown_percentage, and backtests that
+    configuration on the test_days dates that follow. Windows advance by step_days dates (test_days by default)
+    and run concurrently, one per worker process.
+    start_time and end_time restrict every backtest to a time of day. Windows are cut from the dates of the
+    indexed data source, and the rounds are shared with the workers once as in ParameterSweep, so each backtest
+    is served as a slice of the same mapped frame.
+    """
+    train_days: int = 3
+    test_days: int = 1
+    step_days: int = None
+    start_time: str = '00:00:00'
+    end_time: str = '23:59:59'
+    objective: str = 'net_profit'
+    maximize: bool = True
+
+    def windows(self) -> list[dict]:
+        """Cuts the recorded dates into consecutive train and test windows."""
+        if not self.data_source.indexed:
+            self.data_source.build_index()
+        dates = self.data_source.index_dates
+        configurations = self.configurations()
+        windows = []
+        for first in range(0, len(dates) - self.train_days - self.test_days + 1, self.step_days or self.test_days):
+            windows.append({
+                'window': len(windows) + 1,
+                'train_start': dates[first],
+                'train_end': dates[first + self.train_days - 1],
+                'test_start': dates[first + self.train_days],
+                'test_end': dates[first + self.train_days + self.test_days - 1],
+                'configurations': configurations,
+                'objective': self.objective,
+                'maximize': self.maximize,
+            })
+        return windows
+
+    def run(self) -> pl.DataFrame:
+        """Runs every window and returns one row per window with the chosen parameters and the test results."""
+        self._validate_grid()
+        windows = self.windows()
+        if not windows:
+            raise ValueError(f'{len(self.data_source.index_dates)} dates are too few for {self.train_days} train and {self.test_days} test days')
+        backtest_parameters = {**self.backtest_parameters, 'start_time': self.start_time, 'end_time': self.end_time}
+        with tempfile.TemporaryDirectory() as directory:
+            frame_file = write_shared_frame(self.data_source.data, directory)
+            with ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_initialize_worker,
+                initargs=(frame_file, self.strategy, self.risk_manager, backtest_parameters),
+            ) as executor:
+                results = list(executor.map(_run_window, windows))
+        return pl.DataFrame(results)
+
+    def summarize(self, results: pl.DataFrame) -> dict:
+        """Totals the out-of-sample results of every window."""
+        return {
+            'windows': len(results),
+            'profitable_windows': int((results['test_net_profit'] > 0).sum()),
+            'test_net_profit': round(float(results['test_net_profit'].sum()), 2),
+            'worst_test_net_profit': round(float(results['test_net_profit'].min()), 2),
+            'max_test_drawdown_percentage': float(results['test_max_drawdown_percentage'].max()),
+        }
@@ -1,4 +1,4 @@
-from bot.casino.casino import Casino
+from bot.casino.casino import Casino, CasinoSnapshot
 from bot.casino.spribe import Spribe
 from bot.casino.sporty import Sporty
 from bot.casino.msport import MSport
\ No newline at end of file
@@ -13,6 +13,24 @@ from pydantic import BaseModel, HttpUrl, ConfigDict
 from bot.data_source import RoundResult
 
 
+SNAPSHOT_SCRIPT = """
+const isDisplayed = (element) => !!element && !!(element.offsetWidth || element.offsetHeight || element.getClientRects().length);
+const balance = document.getElementsByClassName('balance-amount')[0];
+return {
+    payouts: Array.from(document.getElementsByClassName('payout')).slice(0, 15).map((payout) => payout.innerText.trim()),
+    balance: balance ? balance.innerText.trim() : null,
+    alert_visible: isDisplayed(document.getElementsByClassName('alert-warning')[0]),
+};
+"""
+
+
+class CasinoSnapshot(BaseModel):
+    """The game state read in one WebDriver round-trip: the latest multipliers, newest first, the balance and whether an alert is showing."""
+    multipliers: list[float] = []
+    balance: float = 0.0
+    alert_visible: bool = False
+
+
 class Casino(BaseModel):
     """
     Interface for interacting with the online casino.
@@ -25,6 +43,7 @@ class Casino(BaseModel):
     latest_game_round_multiplier: float = None
     log: logging.Logger = None
     previous_multiplier_history: list[float] = []
+    snapshot: CasinoSnapshot = None
 
     def login(self) -> None:
         """
@@ -159,18 +178,40 @@ class Casino(BaseModel):
         except Exception as e:
             print(f"Error placing bet: {e}")
 
-    def get_latest_multipliers(self) -> list[float]:
+    def read_snapshot(self) -> CasinoSnapshot:
         """
-        Get the latest round multipliers.
+        Reads the latest multipliers, the balance and the alert state with a single execute_script call,
+        where reading them element by element takes a WebDriver round-trip per element and per text.
+        """
+        state = self.driver.execute_script(SNAPSHOT_SCRIPT)
+        return CasinoSnapshot(
+            multipliers=[float(payout[:-1].replace(',', '')) for payout in state['payouts']],
+            balance=float(state['balance'].replace(',', '')) if state['balance'] else 0.0,
+            alert_visible=state['alert_visible'],
+        )
+
+    def take_snapshot(self) -> CasinoSnapshot:
+        """
+        Reads the game state once for a pass of the Executor loop, refreshing the page first if an alert is showing.
+        The snapshot is kept in self.snapshot so every decision in the pass sees the same state.
         """
-        self.handle_alert()
         try:
-            multipliers = self.driver.find_elements(By.CLASS_NAME, 'payout')[:15]
-            multipliers = [float(multiplier.text.strip()[:-1].replace(',', '')) for multiplier in multipliers]
-            return multipliers
+            snapshot = self.read_snapshot()
+            if snapshot.alert_visible:
+                self.log.info("Alert is visible, refreshing the page.")
+                self.refresh()
+                snapshot = self.read_snapshot()
         except Exception as e:
-            print(f"Error getting latest multiplier: {e}")
-            return []
+            print(f"Error taking snapshot: {e}")
+            snapshot = CasinoSnapshot()
+        self.snapshot = snapshot
+        return snapshot
+
+    def get_latest_multipliers(self) -> list[float]:
+        """
+        Get the latest round multipliers.
+        """
+        return self.take_snapshot().multipliers
         
     def is_alert_visible(self) -> bool:
         """
@@ -3,4 +3,8 @@ from bot.data_source.bet_history import BetHistory
 from bot.data_source.round_result import RoundResult
 from bot.data_source.iteration_history import IterationHistory
 from bot.data_source.live_bet_history import LiveBetHistory
-from bot.data_source.decided_multiplier import DecidedMultiplier
\ No newline at end of file
+from bot.data_source.decided_multiplier import DecidedMultiplier
+from bot.data_source.bet_statistics import BetStatistics, BoxStatistics
+from bot.data_source.bet_history_store import BetHistoryStore
+from bot.data_source.live_bet_history_writer import LiveBetHistoryWriter, read_live_bet_history
+from bot.data_source.categorizer import CATEGORIES, category, derived_columns
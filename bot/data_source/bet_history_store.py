@@ -0,0 +1,234 @@
+from collections.abc import Sequence
+
+import numpy as np
+import polars as pl
+
+from bot.data_source.round_result import RoundResult
+from bot.data_source.decided_multiplier import DecidedMultiplier
+from bot.data_source.common_bet_history import CommonBetHistory
+from bot.data_source.bet_history import BetHistory
+from bot.data_source.categorizer import CATEGORIES, category_code, category_codes
+
+
+RECENT_RECORDS = 1024
+
+RESULT_CODES = list(RoundResult)
+
+FLOAT_COLUMNS = [
+    'bet_amount_for_box_one', 'bet_amount_for_box_two', 'multiplier',
+    'multiplier_for_box_one', 'multiplier_for_box_two', 'initial_balance', 'current_balance',
+]
+CODE_COLUMNS = [
+    'result_one', 'result_two',
+    'multiplier_category', 'decided_multiplier_one_category', 'decided_multiplier_two_category',
+]
+
+
+class BetHistoryStore(Sequence):
+    """
+    Bet history kept as one NumPy array per field instead of one pydantic model per round.
+    Results and categories are stored as int8 codes into RESULT_CODES and CATEGORIES.
+
+    Indexing returns a BetHistory (or LiveBetHistory) built on demand, so strategies can keep reading
+    bet_history[-1].result_one, and slicing returns a list of them. Records of the latest RECENT_RECORDS
+    rounds are kept once built, since strategies read the tail of the history every round.
+    Whole columns are available as array views, e.g. store.multipliers[-50:].
+    """
+    def __init__(self, record_type: type[CommonBetHistory] = BetHistory, capacity: int = 1024):
+        self.record_type = record_type
+        self.size = 0
+        self.floats = {column: np.zeros(capacity) for column in FLOAT_COLUMNS}
+        self.codes = {column: np.zeros(capacity, dtype=np.int8) for column in CODE_COLUMNS}
+        self.round_numbers = np.zeros(capacity, dtype=np.int64)
+        self.dates: list[str] = []
+        self.times: list[str] = []
+        self.recent_records: dict[int, CommonBetHistory] = {}
+
+    @classmethod
+    def from_frame(cls, frame: pl.DataFrame, record_type: type[CommonBetHistory] = BetHistory) -> "BetHistoryStore":
+        """
+        Fills a store at once from a frame laid out like bot.backtesting.vectorized.bet_history_frame,
+        with result columns given as codes into RESULT_CODES.
+        """
+        store = cls(record_type=record_type, capacity=max(len(frame), 1))
+        store.size = len(frame)
+        for column in FLOAT_COLUMNS:
+            store.floats[column][:store.size] = frame[column].to_numpy()
+        store.codes['result_one'][:store.size] = frame['result_one'].to_numpy()
+        store.codes['result_two'][:store.size] = frame['result_two'].to_numpy()
+        store.codes['multiplier_category'][:store.size] = category_codes(store.floats['multiplier'][:store.size])
+        store.codes['decided_multiplier_one_category'][:store.size] = category_codes(store.floats['multiplier_for_box_one'][:store.size])
+        store.codes['decided_multiplier_two_category'][:store.size] = category_codes(store.floats['multiplier_for_box_two'][:store.size])
+        if 'round_number' in frame.columns:
+            store.round_numbers[:store.size] = frame['round_number'].to_numpy()
+        store.dates = frame['date'].to_list()
+        store.times = frame['time'].to_list()
+        return store
+
+    @classmethod
+    def from_records(cls, records: list[CommonBetHistory]) -> "BetHistoryStore":
+        """Fills a store from a list of bet history models, keeping the model type of its records."""
+        store = cls(record_type=type(records[0]) if records else BetHistory, capacity=max(len(records), 1))
+        for history in records:
+            store.append(history)
+        return store
+
+    def _grow(self) -> None:
+        capacity = len(self.round_numbers) * 2
+        for columns in (self.floats, self.codes):
+            for column, values in columns.items():
+                columns[column] = np.resize(values, capacity)
+        self.round_numbers = np.resize(self.round_numbers, capacity)
+
+    def append_round(
+        self,
+        date: str,
+        time: str,
+        bet_amount_for_box_one: float,
+        bet_amount_for_box_two: float,
+        multiplier: float,
+        multiplier_for_box_one: float,
+        multiplier_for_box_two: float,
+        result_one: RoundResult,
+        result_two: RoundResult,
+        initial_balance: float,
+        current_balance: float,
+        round_number: int = 0,
+        multiplier_category_code: int = None,
+    ) -> None:
+        """
+        Records a round from its field values, without building a model. Categories are derived from the multipliers,
+        unless the multiplier's category code is passed, e.g. from the multiplier_category_code column of DataSource.
+        """
+        if self.size == len(self.round_numbers):
+            self._grow()
+        i = self.size
+        self.floats['bet_amount_for_box_one'][i] = bet_amount_for_box_one
+        self.floats['bet_amount_for_box_two'][i] = bet_amount_for_box_two
+        self.floats['multiplier'][i] = multiplier
+        self.floats['multiplier_for_box_one'][i] = multiplier_for_box_one
+        self.floats['multiplier_for_box_two'][i] = multiplier_for_box_two
+        self.floats['initial_balance'][i] = initial_balance
+        self.floats['current_balance'][i] = current_balance
+        self.codes['result_one'][i] = RESULT_CODES.index(result_one)
+        self.codes['result_two'][i] = RESULT_CODES.index(result_two)
+        self.codes['multiplier_category'][i] = category_code(multiplier) if multiplier_category_code is None else multiplier_category_code
+        self.codes['decided_multiplier_one_category'][i] = category_code(multiplier_for_box_one)
+        self.codes['decided_multiplier_two_category'][i] = category_code(multiplier_for_box_two)
+        self.round_numbers[i] = round_number
+        self.dates.append(date)
+        self.times.append(time)
+        self.recent_records.pop(i - RECENT_RECORDS, None)
+        self.size += 1
+
+    def append(self, history: CommonBetHistory) -> None:
+        """Records a round given as a bet history model."""
+        self.append_round(
+            date=history.date,
+            time=history.time,
+            bet_amount_for_box_one=history.bet_amount_for_box_one,
+            bet_amount_for_box_two=history.bet_amount_for_box_two,
+            multiplier=history.multiplier,
+            multiplier_for_box_one=history.decided_multiplier.multiplier_for_box_one,
+            multiplier_for_box_two=history.decided_multiplier.multiplier_for_box_two,
+            result_one=history.result_one,
+            result_two=history.result_two,
+            initial_balance=history.initial_balance,
+            current_balance=history.current_balance,
+            round_number=getattr(history, 'round_number', 0),
+        )
+
+    def record(self, i: int) -> CommonBetHistory:
+        record = self.recent_records.get(i)
+        if record is None:
+            record = self._build_record(i)
+            if i >= self.size - RECENT_RECORDS:
+                self.recent_records[i] = record
+        return record
+
+    def _build_record(self, i: int) -> CommonBetHistory:
+        fields = dict(
+            date=self.dates[i],
+            time=self.times[i],
+            bet_amount_for_box_one=float(self.floats['bet_amount_for_box_one'][i]),
+            bet_amount_for_box_two=float(self.floats['bet_amount_for_box_two'][i]),
+            multiplier=float(self.floats['multiplier'][i]),
+            decided_multiplier=DecidedMultiplier.model_construct(
+                multiplier_for_box_one=float(self.floats['multiplier_for_box_one'][i]),
+                multiplier_for_box_two=float(self.floats['multiplier_for_box_two'][i]),
+            ),
+            result_one=RESULT_CODES[self.codes['result_one'][i]],
+            result_two=RESULT_CODES[self.codes['result_two'][i]],
+            initial_balance=float(self.floats['initial_balance'][i]),
+            current_balance=float(self.floats['current_balance'][i]),
+            multiplier_category=CATEGORIES[self.codes['multiplier_category'][i]],
+            decided_multiplier_one_category=CATEGORIES[self.codes['decided_multiplier_one_category'][i]],
+            decided_multiplier_two_category=CATEGORIES[self.codes['decided_multiplier_two_category'][i]],
+        )
+        if 'round_number' in self.record_type.model_fields:
+            fields['round_number'] = int(self.round_numbers[i])
+        return self.record_type.model_construct(**fields)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __getitem__(self, index: int | slice) -> CommonBetHistory | list[CommonBetHistory]:
+        if isinstance(index, slice):
+            return [self.record(i) for i in range(*index.indices(self.size))]
+        if index < 0:
+            index += self.size
+        if not 0 <= index < self.size:
+            raise IndexError('bet history index out of range')
+        return self.record(index)
+
+    def __iter__(self):
+        for i in range(self.size):
+            yield self.record(i)
+
+    def column(self, name: str) -> np.ndarray:
+        """Returns a read-only view of a stored column, trimmed to the recorded rounds."""
+        if name == 'round_number':
+            view = self.round_numbers[:self.size]
+        elif name in self.floats:
+            view = self.floats[name][:self.size]
+        else:
+            view = self.codes[name][:self.size]
+        view = view.view()
+        view.flags.writeable = False
+        return view
+
+    @property
+    def multipliers(self) -> np.ndarray:
+        return self.column('multiplier')
+
+    @property
+    def results_one(self) -> np.ndarray:
+        return self.column('result_one')
+
+    @property
+    def results_two(self) -> np.ndarray:
+        return self.column('result_two')
+
+    @property
+    def multiplier_categories(self) -> np.ndarray:
+        return self.column('multiplier_category')
+
+    @property
+    def current_balances(self) -> np.ndarray:
+        return self.column('current_balance')
+
+    def to_frame(self) -> pl.DataFrame:
+        """Returns the recorded rounds as a frame, with results and categories decoded to strings."""
+        results = pl.Series([result.value for result in RESULT_CODES])
+        categories = pl.Series(CATEGORIES)
+        return pl.DataFrame({
+            'round_number': self.column('round_number'),
+            'date': self.dates,
+            'time': self.times,
+            **{column: self.column(column) for column in FLOAT_COLUMNS},
+            'result_one': results.gather(self.column('result_one')),
+            'result_two': results.gather(self.column('result_two')),
+            'multiplier_category': categories.gather(self.column('multiplier_category')),
+            'decided_multiplier_one_category': categories.gather(self.column('decided_multiplier_one_category')),
+            'decided_multiplier_two_category': categories.gather(self.column('decided_multiplier_two_category')),
+        })
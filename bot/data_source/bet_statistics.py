@@ -0,0 +1,79 @@
+from pydantic import BaseModel, Field
+
+from bot.data_source.round_result import RoundResult
+from bot.data_source.common_bet_history import CommonBetHistory
+
+
+class BoxStatistics(BaseModel):
+    wins: int = 0
+    losses: int = 0
+    misses: int = 0
+    draws: int = 0
+    win_streak: int = 0
+    loss_streak: int = 0
+    longest_win_streak: int = 0
+    longest_loss_streak: int = 0
+
+    def update(self, result: RoundResult) -> None:
+        """Counts a round's result. Misses count as losses for streaks, draws leave streaks untouched."""
+        if result == RoundResult.WIN:
+            self.wins += 1
+            self.win_streak += 1
+            self.loss_streak = 0
+            self.longest_win_streak = max(self.longest_win_streak, self.win_streak)
+        elif result == RoundResult.DRAW:
+            self.draws += 1
+        else:
+            if result == RoundResult.MISS:
+                self.misses += 1
+            else:
+                self.losses += 1
+            self.loss_streak += 1
+            self.win_streak = 0
+            self.longest_loss_streak = max(self.longest_loss_streak, self.loss_streak)
+
+
+class BetStatistics(BaseModel):
+    """Running statistics of a bet history, updated in constant time as each round is recorded."""
+    rounds: int = 0
+    box_one: BoxStatistics = Field(default_factory=BoxStatistics)
+    box_two: BoxStatistics = Field(default_factory=BoxStatistics)
+    starting_balance: float = None
+    current_balance: float = None
+    peak_balance: float = None
+    max_drawdown: float = 0.0
+    max_drawdown_percentage: float = 0.0
+
+    @property
+    def total_wins(self) -> int:
+        return self.box_one.wins + self.box_two.wins
+
+    @property
+    def total_losses(self) -> int:
+        return self.box_one.losses + self.box_two.losses
+
+    @property
+    def profit_and_loss(self) -> float:
+        if self.starting_balance is None:
+            return 0.0
+        return round(self.current_balance - self.starting_balance, 2)
+
+    @property
+    def drawdown(self) -> float:
+        if self.peak_balance is None:
+            return 0.0
+        return round(self.peak_balance - self.current_balance, 2)
+
+    def update(self, history: CommonBetHistory) -> None:
+        """Adds a newly recorded round to the statistics."""
+        self.rounds += 1
+        self.box_one.update(history.result_one)
+        self.box_two.update(history.result_two)
+        if self.starting_balance is None:
+            self.starting_balance = history.initial_balance
+            self.peak_balance = history.initial_balance
+        self.current_balance = history.current_balance
+        self.peak_balance = max(self.peak_balance, history.current_balance)
+        if self.drawdown > self.max_drawdown:
+            self.max_drawdown = self.drawdown
+            self.max_drawdown_percentage = (self.drawdown / self.peak_balance) * 100 if self.peak_balance > 0 else 0.0
@@ -0,0 +1,48 @@
+import numpy as np
+import polars as pl
+
+
+CATEGORIES = ['B', 'P', 'Pk']
+
+MULTIPLIER_BUCKETS = [1.00, 1.50, 2.00, 3.00, 5.00, 10.00, 20.00, 50.00, 100.00]
+
+
+def category(multiplier: float) -> str:
+    """Returns B for 1.00 to 1.99, P for 2.00 to 9.99 and Pk otherwise."""
+    return CATEGORIES[category_code(multiplier)]
+
+
+def category_code(multiplier: float) -> int:
+    """Returns the index of the multiplier's category in CATEGORIES."""
+    return 0 if 1.00 <= multiplier <= 1.99 else 1 if 2.00 <= multiplier <= 9.99 else 2
+
+
+def category_codes(multipliers: np.ndarray) -> np.ndarray:
+    return np.where((multipliers >= 1.00) & (multipliers <= 1.99), 0, np.where((multipliers >= 2.00) & (multipliers <= 9.99), 1, 2)).astype(np.int8)
+
+
+def category_code_expression(column: str) -> pl.Expr:
+    return (
+        pl.when((pl.col(column) >= 1.00) & (pl.col(column) <= 1.99)).then(pl.lit(0, dtype=pl.Int8))
+        .when((pl.col(column) >= 2.00) & (pl.col(column) <= 9.99)).then(pl.lit(1, dtype=pl.Int8))
+        .otherwise(pl.lit(2, dtype=pl.Int8))
+    )
+
+
+def category_expression(column: str) -> pl.Expr:
+    return category_code_expression(column).replace_strict([0, 1, 2], CATEGORIES, return_dtype=pl.String)
+
+
+def bucket_expression(column: str) -> pl.Expr:
+    """Index of the highest MULTIPLIER_BUCKETS edge the multiplier reaches, -1 below the first."""
+    return pl.sum_horizontal([pl.col(column) >= edge for edge in MULTIPLIER_BUCKETS]).cast(pl.Int8) - 1
+
+
+def derived_columns(column: str = 'multiplier') -> list[pl.Expr]:
+    """The features DataSource computes once per round: category, category code, log multiplier and bucket index."""
+    return [
+        category_expression(column).alias(f'{column}_category'),
+        category_code_expression(column).alias(f'{column}_category_code'),
+        pl.col(column).log().alias(f'log_{column}'),
+        bucket_expression(column).alias(f'{column}_bucket'),
+    ]
@@ -1,44 +1,151 @@
+import os
 import random
 import hashlib
+from bisect import bisect_left, bisect_right
 from datetime import datetime, timedelta
 
 import polars as pl
 
+from bot.data_source.round_store import RoundStore, parse_rounds_csv, as_data_source_frame
+from bot.data_source.live_bet_history_writer import read_live_bet_history
+from bot.data_source.categorizer import derived_columns
+from bot.utils.fairness import verify_rounds
+
 class DataSource:
     """
     Handles loading and preprocessing of historical game data using Polars.
+    In indexed mode the rounds are sorted by date and time and date/time windows are served as slices.
+    With verified_only only rounds whose stored hash matches their seeds are loaded.
     """
-    def __init__(self, csv_file: str):
+    def __init__(self, csv_file: str, indexed: bool = False, verified_only: bool = False):
         self.csv_file = csv_file
-        self.data = self._load_data()
+        self.store = RoundStore(csv_file)
+        self.indexed = False
+        self.verified_only = verified_only
+        self.load_data()
+        if indexed:
+            self.build_index()
+
+    @classmethod
+    def from_frame(cls, data: pl.DataFrame, indexed: bool = False) -> "DataSource":
+        """Wraps rounds that are already loaded, e.g. a frame shared between processes, without reading the CSV."""
+        data_source = cls.__new__(cls)
+        data_source.csv_file = None
+        data_source.store = None
+        data_source.indexed = False
+        data_source.verified_only = False
+        data_source.data = data if 'multiplier_category' in data.columns else data.with_columns(derived_columns())
+        data_source.csv_offset = None
+        if indexed:
+            data_source.build_index()
+        return data_source
 
     def _load_data(self, start_time: str = '07:00:00', end_time: str = '10:00:00') -> pl.DataFrame:
-        start_time = datetime.strptime(start_time, "%H:%M:%S").time()
-        end_time = datetime.strptime(end_time, "%H:%M:%S").time()
-        column_names = [
-            "game_round", "date", "time", "server_seed",
-            "player_seed_1", "player_seed_2", "player_seed_3",
-            "stored_hash", "multiplier"
-        ]
-        df = pl.read_csv(
-            self.csv_file,
-            has_header=False,
-            new_columns=column_names
-        ).select(
-            ["game_round", "date", "time", "multiplier"]
-        ).filter(
-            (pl.col("time") >= str(start_time)) & (pl.col("time") <= str(end_time))
-        )
-        return df
+        return self.store.get_data_by_date_and_time(start_time=start_time, end_time=end_time, verified_only=self.verified_only)
     
     def load_data(self, start_time: str = '07:00:00', end_time: str = '10:00:00') -> None:
         self.data = self._load_data(start_time=start_time, end_time=end_time)
-    
+        self.csv_offset = self.store.csv_size
+        self.load_start_time = datetime.strptime(start_time, "%H:%M:%S").time()
+        self.load_end_time = datetime.strptime(end_time, "%H:%M:%S").time()
+        if self.indexed:
+            self.build_index()
+
+    def refresh(self) -> None:
+        """
+        Appends the rows added to the CSV since the last load or refresh, parsing only the new bytes.
+        Falls back to a full load when the CSV shrank or the data did not come from the CSV.
+        """
+        if self.store is None:
+            return
+        if self.csv_offset is None or os.path.getsize(self.csv_file) < self.csv_offset:
+            self.load_data()
+            return
+        with open(self.csv_file, "rb") as file:
+            file.seek(self.csv_offset)
+            content = file.read()
+        content = content[:content.rfind(b"\n") + 1]
+        if not content:
+            return
+        self.csv_offset += len(content)
+        new_rows = parse_rounds_csv(content).filter(pl.col("time").is_between(self.load_start_time, self.load_end_time))
+        if self.verified_only:
+            fair, _ = verify_rounds(new_rows)
+            new_rows = new_rows.filter(pl.Series(fair))
+        new_rows = as_data_source_frame(new_rows)
+        if new_rows.is_empty():
+            return
+        if self.indexed and (self.data.is_empty() or new_rows["datetime"].min() < self.data["datetime"].max()):
+            self.data.extend(new_rows)
+            self.build_index()
+            return
+        self.data.extend(new_rows)
+        if self.indexed:
+            self._extend_index(new_rows)
+
+    def build_index(self) -> None:
+        """
+        Sorts the rounds by date and time, adds a typed datetime column and records the offset of each date,
+        so date and time windows become slices of the frame instead of full scans.
+        """
+        if "datetime" not in self.data.columns or not self.data["datetime"].is_sorted():
+            self.data = self.data.sort(["date", "time"], maintain_order=True)
+        if "datetime" not in self.data.columns:
+            self.data = self.data.with_columns(
+                pl.concat_str([pl.col("date"), pl.col("time")], separator=" ").str.to_datetime("%Y-%m-%d %H:%M:%S").alias("datetime")
+            )
+        offsets = self.data.with_row_index("offset").group_by("date", maintain_order=True).agg(
+            pl.col("offset").first(),
+            pl.len().alias("length"),
+        )
+        self.index_dates: list[str] = offsets["date"].to_list()
+        self.index_offsets: list[int] = offsets["offset"].to_list()
+        self.index_lengths: list[int] = offsets["length"].to_list()
+        self.index_times: list[str] = self.data["time"].to_list()
+        self.window_cache: dict[tuple, pl.DataFrame] = {}
+        self.indexed = True
+
+    def _extend_index(self, new_rows: pl.DataFrame) -> None:
+        """Records rows appended after the last indexed round without re-sorting the frame."""
+        offset = len(self.data) - len(new_rows)
+        for date in new_rows["date"].to_list():
+            if self.index_dates and self.index_dates[-1] == date:
+                self.index_lengths[-1] += 1
+            else:
+                self.index_dates.append(date)
+                self.index_offsets.append(offset)
+                self.index_lengths.append(1)
+            offset += 1
+        self.index_times.extend(new_rows["time"].to_list())
+        self.window_cache.clear()
+
+    def _get_indexed_window(self, start_date: str, end_date: str, start_time: str, end_time: str) -> pl.DataFrame:
+        first = bisect_left(self.index_dates, start_date)
+        last = bisect_right(self.index_dates, end_date)
+        if first >= last:
+            return self.data.clear()
+        if start_time <= "00:00:00" and end_time >= "23:59:59":
+            offset = self.index_offsets[first]
+            return self.data.slice(offset, self.index_offsets[last - 1] + self.index_lengths[last - 1] - offset)
+        slices = []
+        for offset, length in zip(self.index_offsets[first:last], self.index_lengths[first:last]):
+            start = bisect_left(self.index_times, start_time, offset, offset + length)
+            end = bisect_right(self.index_times, end_time, offset, offset + length)
+            if end > start:
+                slices.append(self.data.slice(start, end - start))
+        return pl.concat(slices, rechunk=False) if slices else self.data.clear()
+
     def get_data_by_date_and_time(self, start_date: str, end_date: str = None, start_time: str = '00:00:00', end_time: str = '23:59:59') -> pl.DataFrame:
+        key = ("by", start_date, end_date, start_time, end_time)
+        if self.indexed and key in self.window_cache:
+            return self.window_cache[key]
         start_date = datetime.strptime(start_date, "%Y-%m-%d").date()
         end_date = datetime.strptime(end_date, "%Y-%m-%d").date() if end_date else start_date
         start_time = datetime.strptime(start_time, "%H:%M:%S").time()
         end_time = datetime.strptime(end_time, "%H:%M:%S").time()
+        if self.indexed:
+            self.window_cache[key] = self._get_indexed_window(str(start_date), str(end_date), str(start_time), str(end_time))
+            return self.window_cache[key]
         return self.data.filter(
             (pl.col("date") >= str(start_date)) &
             (pl.col("date") <= str(end_date)) &
@@ -47,10 +154,16 @@ class DataSource:
         )
     
     def get_data_before_date_and_time(self, start_date: str, look_back: int, start_time: str = '00:00:00', end_time: str = '23:59:59') -> pl.DataFrame:
+        key = ("before", start_date, look_back, start_time, end_time)
+        if self.indexed and key in self.window_cache:
+            return self.window_cache[key]
         start_date = datetime.strptime(start_date, "%Y-%m-%d").date()
         end_date = start_date - timedelta(days=look_back)
         start_time = datetime.strptime(start_time, "%H:%M:%S").time()
         end_time = datetime.strptime(end_time, "%H:%M:%S").time()
+        if self.indexed:
+            self.window_cache[key] = self._get_indexed_window(str(end_date), str(start_date), str(start_time), str(end_time))
+            return self.window_cache[key]
         return self.data.filter(
             (pl.col("date") <= str(start_date)) &
             (pl.col('date') >= str(end_date)) &
@@ -59,16 +172,22 @@ class DataSource:
         )
     
     def repurpose_live_bet_history(self, bet_history_file: str) -> None:
-        bet_history: pl.DataFrame = pl.read_json(
-            bet_history_file,
-        ).select(
+        bet_history: pl.DataFrame = read_live_bet_history(bet_history_file)
+        self.repurpose_bet_history(bet_history)
+
+    def repurpose_bet_history(self, bet_history: pl.DataFrame) -> None:
+        """Replaces the rounds with those of a live bet history that is already loaded."""
+        bet_history = bet_history.select(
             ["date", "time", "multiplier"]
         )
         bet_history = bet_history.with_columns(
-            pl.Series("game_round", [random.randint(1, 10000) for _ in range(len(bet_history))])
+            pl.Series("game_round", [random.randint(1, 10000) for _ in range(len(bet_history))]),
+            *derived_columns(),
         )
         self.data = bet_history
-
+        self.csv_offset = None
+        if self.indexed:
+            self.build_index()
 
 if __name__ == '__main__':
     data_source = DataSource(csv_file="sporty_aviator_data.csv")
@@ -0,0 +1,55 @@
+import io
+import os
+import json
+
+import polars as pl
+
+from bot.data_source.common_bet_history import CommonBetHistory
+
+
+def bet_history_record(history: CommonBetHistory) -> dict:
+    """Serializes a round the way live bet history files store it."""
+    return history.model_dump() | {"result_one": str(history.result_one.value), "result_two": str(history.result_two.value)}
+
+
+def read_live_bet_history(bet_history_file: str) -> pl.DataFrame:
+    """
+    Reads a live bet history file, either a JSON array (.json) or one record per line (.jsonl).
+    A partially written last line, left by a crash mid-write, is ignored.
+    """
+    if not bet_history_file.endswith('.jsonl'):
+        return pl.read_json(bet_history_file)
+    with open(bet_history_file, 'rb') as file:
+        content = file.read()
+    content = content[:content.rfind(b'\n') + 1]
+    if not content:
+        return pl.DataFrame()
+    return pl.read_ndjson(io.BytesIO(content))
+
+
+class LiveBetHistoryWriter:
+    """
+    Appends each recorded round to a JSONL file as one line, instead of rewriting the whole history.
+    Lines are flushed to the OS on every write and fsynced to disk every fsync_every rounds.
+    """
+    def __init__(self, bet_history_file: str, fsync_every: int = 10):
+        self.bet_history_file = bet_history_file
+        self.fsync_every = fsync_every
+        self.unsynced_rounds = 0
+        self.file = open(bet_history_file, 'a')
+
+    def write(self, history: CommonBetHistory) -> None:
+        self.file.write(json.dumps(bet_history_record(history)) + '\n')
+        self.file.flush()
+        self.unsynced_rounds += 1
+        if self.unsynced_rounds >= self.fsync_every:
+            self.sync()
+
+    def sync(self) -> None:
+        os.fsync(self.file.fileno())
+        self.unsynced_rounds = 0
+
+    def close(self) -> None:
+        if not self.file.closed:
+            self.sync()
+            self.file.close()
@@ -0,0 +1,149 @@
+import io
+import os
+from datetime import datetime
+
+import polars as pl
+import pyarrow.parquet as pq
+
+from bot.data_source.categorizer import derived_columns
+from bot.utils.fairness import verify_parquet
+
+
+COLUMN_NAMES = [
+    "game_round", "date", "time", "server_seed",
+    "player_seed_1", "player_seed_2", "player_seed_3",
+    "stored_hash", "multiplier"
+]
+
+
+ROUND_SCHEMA = {
+    "game_round": pl.Int64,
+    "date": pl.Date,
+    "time": pl.Time,
+    "server_seed": pl.String,
+    "player_seed_1": pl.String,
+    "player_seed_2": pl.String,
+    "player_seed_3": pl.String,
+    "stored_hash": pl.String,
+    "multiplier": pl.Float64,
+    "datetime": pl.Datetime("us"),
+}
+
+
+ROW_GROUP_SIZE = 100_000
+
+
+def parse_rounds_csv(content: bytes) -> pl.DataFrame:
+    """
+    Parses raw rows of the rounds CSV into typed columns.
+    :param content: Complete lines of the CSV, without a header.
+    :return: DataFrame with Date, Time and Datetime columns alongside the CSV columns.
+    """
+    if not content:
+        return pl.DataFrame(schema=ROUND_SCHEMA)
+    return pl.read_csv(
+        io.BytesIO(content),
+        has_header=False,
+        new_columns=COLUMN_NAMES,
+        schema_overrides={
+            "game_round": pl.Int64,
+            "date": pl.String,
+            "time": pl.String,
+            "server_seed": pl.String,
+            "player_seed_1": pl.String,
+            "player_seed_2": pl.String,
+            "player_seed_3": pl.String,
+            "stored_hash": pl.String,
+            "multiplier": pl.Float64,
+        },
+    ).with_columns(
+        pl.col("date").str.to_date("%Y-%m-%d"),
+        pl.col("time").str.to_time("%H:%M:%S"),
+    ).with_columns(
+        pl.col("date").dt.combine(pl.col("time")).alias("datetime"),
+    )
+
+
+def as_data_source_frame(rounds: pl.DataFrame | pl.LazyFrame) -> pl.DataFrame | pl.LazyFrame:
+    """Selects the columns DataSource exposes, with date and time rendered back to strings and the derived multiplier columns."""
+    return rounds.select(
+        "game_round",
+        pl.col("date").dt.to_string("%Y-%m-%d"),
+        pl.col("time").dt.to_string("%H:%M:%S"),
+        "multiplier",
+        "datetime",
+        *derived_columns("multiplier"),
+    )
+
+
+class RoundStore:
+    """
+    Parses the rounds CSV once into typed columns and keeps them in a Parquet file next to the CSV.
+    The Parquet file records the modification time of the CSV it was built from and is rebuilt
+    whenever the CSV's modification time changes. verify adds the `fair` and `recomputed_multiplier`
+    columns to the file; a rebuild drops them until the next verification.
+    """
+    def __init__(self, csv_file: str):
+        self.csv_file = csv_file
+        self.parquet_file = f"{os.path.splitext(csv_file)[0]}.parquet"
+        self.csv_size = 0
+
+    def is_fresh(self) -> bool:
+        if not os.path.exists(self.parquet_file):
+            return False
+        stat = os.stat(self.csv_file)
+        metadata = pq.read_schema(self.parquet_file).metadata or {}
+        return metadata.get(b"csv_mtime_ns") == str(stat.st_mtime_ns).encode()
+
+    def build(self) -> None:
+        """Parses the complete lines of the CSV and writes them to the Parquet file."""
+        stat = os.stat(self.csv_file)
+        with open(self.csv_file, "rb") as file:
+            content = file.read()
+        content = content[:content.rfind(b"\n") + 1]
+        table = parse_rounds_csv(content).sort("datetime", maintain_order=True).to_arrow()
+        table = table.replace_schema_metadata({
+            "csv_mtime_ns": str(stat.st_mtime_ns),
+            "csv_size": str(len(content)),
+        })
+        temporary_file = f"{self.parquet_file}.tmp"
+        pq.write_table(table, temporary_file, row_group_size=ROW_GROUP_SIZE)
+        os.replace(temporary_file, self.parquet_file)
+
+    def scan(self) -> pl.LazyFrame:
+        """Returns a lazy scan of the typed rounds, rebuilding the Parquet file first if the CSV changed."""
+        if not self.is_fresh():
+            self.build()
+        metadata = pq.read_schema(self.parquet_file).metadata
+        self.csv_size = int(metadata[b"csv_size"])
+        return pl.scan_parquet(self.parquet_file)
+
+    def is_verified(self) -> bool:
+        return "fair" in pq.read_schema(self.parquet_file).names
+
+    def verify(self, max_workers: int = None) -> None:
+        """Verifies every round of the Parquet file in parallel, rebuilding it first if the CSV changed."""
+        self.scan()
+        verify_parquet(self.parquet_file, max_workers=max_workers)
+
+    def get_data_by_date_and_time(self, start_date: str = None, end_date: str = None, start_time: str = '00:00:00', end_time: str = '23:59:59', verified_only: bool = False) -> pl.DataFrame:
+        """
+        Same contract as DataSource.get_data_by_date_and_time, evaluated as a Parquet scan so the
+        date and time predicates are pushed down to the file. Without a start_date every date is kept.
+        With verified_only only rounds whose hash matches their seeds are kept, verifying the file first if needed.
+        """
+        rounds = self.scan()
+        if verified_only and not self.is_verified():
+            self.verify()
+            rounds = self.scan()
+        predicate = pl.col("time").is_between(
+            datetime.strptime(start_time, "%H:%M:%S").time(),
+            datetime.strptime(end_time, "%H:%M:%S").time(),
+        )
+        if start_date:
+            start_date = datetime.strptime(start_date, "%Y-%m-%d").date()
+            end_date = datetime.strptime(end_date, "%Y-%m-%d").date() if end_date else start_date
+            predicate = predicate & pl.col("date").is_between(start_date, end_date)
+        if verified_only:
+            predicate = predicate & pl.col("fair")
+        return as_data_source_frame(rounds.filter(predicate)).collect()
@@ -0,0 +1,2 @@
+from bot.indicators.blue_debt_tracker import BlueDebtTracker, scan_debts, track_debts
+from bot.indicators.streaming import StreamingIndicator, SMA, EMA, RollingQuantile, RollingCount, IndicatorPipeline
\ No newline at end of file
@@ -0,0 +1,98 @@
+from bisect import bisect_right
+
+
+class BlueDebtTracker:
+    """
+    Tracks unresolved Blue debts round by round, instead of rescanning every multiplier like scan_debts.
+
+    A Blue (lower_bound <= multiplier < upper_bound) opens a debt with the initial target, and every later round
+    either resolves it (multiplier >= target) or raises its target by the increment. All open debts escalate
+    together, so a debt's target only depends on the round it was opened in, and older debts always have higher
+    targets. Open debts are therefore kept as a stack of opening rounds: a new round resolves debts from the top
+    until one holds, which is amortized O(1) per round, and the targets at least some minimum are found by bisection.
+
+    Targets are counted in whole cents, so they match the round(target + increment, 2) steps of scan_debts.
+    """
+    def __init__(self, initial_target: float = 2.00, lower_bound: float = 1.00, upper_bound: float = 2.00, increment: float = 1.00):
+        if increment < 0:
+            raise ValueError('increment must not be negative')
+        self.initial_target = initial_target
+        self.lower_bound = lower_bound
+        self.upper_bound = upper_bound
+        self.increment = increment
+        self.initial_target_cents = round(initial_target * 100)
+        self.increment_cents = round(increment * 100)
+        self.rounds = 0
+        self.open_debts: list[int] = []
+
+    def target(self, opened: int) -> float:
+        """Returns the current target of the debt opened in the given round."""
+        return (self.initial_target_cents + (self.rounds - opened - 1) * self.increment_cents) / 100
+
+    def update(self, multiplier: float) -> None:
+        """Resolves the debts the multiplier pays, escalates the rest and opens a debt if the multiplier is a Blue."""
+        while self.open_debts and multiplier >= self.target(self.open_debts[-1]):
+            self.open_debts.pop()
+        if self.lower_bound <= multiplier < self.upper_bound:
+            self.open_debts.append(self.rounds)
+        self.rounds += 1
+
+    def extend(self, multipliers) -> None:
+        for multiplier in multipliers:
+            self.update(multiplier)
+
+    def targets(self) -> list[float]:
+        """Returns the targets of the open debts, oldest first, the same list scan_debts returns."""
+        return [self.target(opened) for opened in self.open_debts]
+
+    def sorted_targets(self, minimum_multiplier: float = 10.00) -> list[float]:
+        """Returns the targets of at least minimum_multiplier in ascending order, the same list EagleShot.sort returns for them."""
+        count = bisect_right(self.open_debts, -minimum_multiplier, key=lambda opened: -self.target(opened))
+        return [self.target(opened) for opened in reversed(self.open_debts[:count])]
+
+    def reset(self) -> None:
+        self.rounds = 0
+        self.open_debts.clear()
+
+
+def scan_debts(
+    multipliers: list[float],
+    initial_target: float = 2.00,
+    lower_bound: float = 1.00,
+    upper_bound: float = 2.00,
+    increment: float = 1.00,
+) -> list[float]:
+    """
+    Returns the targets of the unresolved Blue debts, oldest first, by rescanning every multiplier after each Blue.
+    This is the quadratic scan the EagleShot strategies started from, kept as the reference BlueDebtTracker is
+    tested against.
+    """
+    targets = []
+    for i, current in enumerate(multipliers):
+        if lower_bound <= current < upper_bound:
+            target = initial_target
+            for later in multipliers[i + 1:]:
+                if later >= target:
+                    break
+                target = round(target + increment, 2)
+            else:
+                targets.append(target)
+    return targets
+
+
+def track_debts(
+    debt_tracker: BlueDebtTracker | None,
+    multipliers,
+    initial_target: float = 2.00,
+    lower_bound: float = 1.00,
+    upper_bound: float = 2.00,
+    increment: float = 1.00,
+) -> BlueDebtTracker:
+    """
+    Feeds the multipliers recorded since the tracker last saw the history, building a new tracker when there is none
+    or the history was reset, and returns the tracker.
+    """
+    if debt_tracker is None or len(multipliers) < debt_tracker.rounds:
+        debt_tracker = BlueDebtTracker(initial_target, lower_bound, upper_bound, increment)
+    debt_tracker.extend(multipliers[debt_tracker.rounds:])
+    return debt_tracker
@@ -0,0 +1,140 @@
+import math
+from bisect import bisect_left, insort
+from collections import deque
+
+
+class StreamingIndicator:
+    """
+    An indicator over a series that is updated with one value per round, keeping only what it needs for the next
+    update. value is the latest output and previous the one before it, both None until the first window is full.
+    """
+    def __init__(self, period: int):
+        if period < 1:
+            raise ValueError('period must be at least 1')
+        self.period = period
+        self.rounds = 0
+        self.value: float = None
+        self.previous: float = None
+
+    def update(self, value: float) -> float:
+        self.previous = self.value
+        self.value = self._next(value)
+        self.rounds += 1
+        return self.value
+
+    def _next(self, value: float) -> float:
+        raise NotImplementedError
+
+    @property
+    def ready(self) -> bool:
+        return self.value is not None and self.previous is not None
+
+    def crossed_above(self, other: "StreamingIndicator") -> bool:
+        """Whether this indicator moved above the other in the latest round."""
+        return self.ready and other.ready and self.value > other.value and self.previous <= other.previous
+
+    def crossed_below(self, other: "StreamingIndicator") -> bool:
+        """Whether this indicator moved below the other in the latest round."""
+        return self.ready and other.ready and self.value < other.value and self.previous >= other.previous
+
+
+class SMA(StreamingIndicator):
+    """Simple moving average over the latest period values, kept as a running sum."""
+    def __init__(self, period: int):
+        super().__init__(period)
+        self.window: deque[float] = deque()
+        self.total = 0.0
+
+    def _next(self, value: float) -> float:
+        self.window.append(value)
+        self.total += value
+        if len(self.window) > self.period:
+            self.total -= self.window.popleft()
+        if len(self.window) < self.period:
+            return None
+        return self.total / self.period
+
+
+class EMA(StreamingIndicator):
+    """Exponential moving average, seeded with the simple average of the first period values like talipp's EMA."""
+    def __init__(self, period: int):
+        super().__init__(period)
+        self.multiplier = 2.0 / (period + 1.0)
+        self.seed = 0.0
+
+    def _next(self, value: float) -> float:
+        if self.value is not None:
+            return self.multiplier * value + (1.0 - self.multiplier) * self.value
+        self.seed += value
+        if self.rounds + 1 < self.period:
+            return None
+        return self.seed / self.period
+
+
+class RollingQuantile(StreamingIndicator):
+    """Quantile of the latest period values, interpolated linearly like numpy.quantile, from a sorted window."""
+    def __init__(self, period: int, quantile: float = 0.5):
+        if not 0.0 <= quantile <= 1.0:
+            raise ValueError('quantile must be between 0.0 and 1.0 inclusive')
+        super().__init__(period)
+        self.quantile = quantile
+        self.window: deque[float] = deque()
+        self.sorted_window: list[float] = []
+
+    def _next(self, value: float) -> float:
+        self.window.append(value)
+        insort(self.sorted_window, value)
+        if len(self.window) > self.period:
+            self.sorted_window.pop(bisect_left(self.sorted_window, self.window.popleft()))
+        if len(self.window) < self.period:
+            return None
+        position = self.quantile * (self.period - 1)
+        lower = math.floor(position)
+        upper = min(lower + 1, self.period - 1)
+        return self.sorted_window[lower] + (self.sorted_window[upper] - self.sorted_window[lower]) * (position - lower)
+
+
+class RollingCount(StreamingIndicator):
+    """Number of the latest period values with lower <= value < upper, e.g. the Blues of the last 50 rounds."""
+    def __init__(self, period: int, lower: float = -math.inf, upper: float = math.inf):
+        super().__init__(period)
+        self.lower = lower
+        self.upper = upper
+        self.window: deque[bool] = deque()
+        self.count = 0
+
+    def _next(self, value: float) -> float:
+        counted = self.lower <= value < self.upper
+        self.window.append(counted)
+        self.count += counted
+        if len(self.window) > self.period:
+            self.count -= self.window.popleft()
+        if len(self.window) < self.period:
+            return None
+        return self.count
+
+
+class IndicatorPipeline:
+    """
+    Named streaming indicators fed one multiplier per round by the Backtester and the Executor.
+    Strategies subscribe to the indicators they need in register_indicators and read them by name when deciding.
+    Subscribing to a name that is already registered returns the existing indicator, so strategies share them.
+    """
+    def __init__(self):
+        self.indicators: dict[str, StreamingIndicator] = {}
+        self.rounds = 0
+
+    def subscribe(self, name: str, indicator: StreamingIndicator) -> StreamingIndicator:
+        """Registers the indicator under the name, unless one already is, and returns the registered indicator."""
+        return self.indicators.setdefault(name, indicator)
+
+    def update(self, multiplier: float) -> None:
+        for indicator in self.indicators.values():
+            indicator.update(multiplier)
+        self.rounds += 1
+
+    def __getitem__(self, name: str) -> StreamingIndicator:
+        return self.indicators[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.indicators
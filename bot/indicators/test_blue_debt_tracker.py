@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+from bot.indicators import BlueDebtTracker, scan_debts, track_debts
+
+
+SETTINGS = [
+    (2.00, 1.00, 2.00, 1.00, 10.00),
+    (2.00, 1.00, 2.30, 1.00, 10.00),
+    (3.00, 1.00, 2.00, 0.50, 5.00),
+    (1.50, 1.20, 3.00, 0.25, 4.00),
+]
+
+
+def random_multipliers(rng: np.random.Generator, rounds: int) -> list[float]:
+    return np.maximum(np.floor(0.97 / (1.0 - rng.random(rounds)) * 100) / 100, 1.00).tolist()
+
+
+@pytest.mark.parametrize('seed', range(10))
+@pytest.mark.parametrize('initial_target, lower_bound, upper_bound, increment, minimum_multiplier', SETTINGS)
+def test_tracker_matches_scan(seed, initial_target, lower_bound, upper_bound, increment, minimum_multiplier):
+    multipliers = random_multipliers(np.random.default_rng(seed), 300)
+    debt_tracker = BlueDebtTracker(initial_target, lower_bound, upper_bound, increment)
+    for i, multiplier in enumerate(multipliers):
+        debt_tracker.update(multiplier)
+        expected = scan_debts(multipliers[:i + 1], initial_target, lower_bound, upper_bound, increment)
+        assert debt_tracker.targets() == expected, f'round {i}'
+        assert debt_tracker.sorted_targets(minimum_multiplier) == sorted(m for m in expected if m >= minimum_multiplier), f'round {i}'
+
+
+def test_track_debts_follows_a_growing_history_and_starts_over_after_a_reset():
+    multipliers = random_multipliers(np.random.default_rng(0), 200)
+    debt_tracker = None
+    for end in (50, 51, 120, 200):
+        debt_tracker = track_debts(debt_tracker, multipliers[:end])
+        assert debt_tracker.rounds == end
+    tracked = debt_tracker
+    debt_tracker = track_debts(debt_tracker, multipliers[:30])
+    assert debt_tracker is not tracked
+    expected = BlueDebtTracker()
+    expected.extend(multipliers[:30])
+    assert debt_tracker.targets() == expected.targets()
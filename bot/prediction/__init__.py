@@ -0,0 +1,5 @@
+from bot.prediction.online_markov_model import OnlineMarkovModel
+from bot.prediction.ngram_index import NgramIndex
+from bot.prediction.prediction_module_loader import PredictionModuleLoader
+from bot.prediction.ngram_code_cache import NgramCodeCache, generate_offline_ngram_code
+from bot.prediction.category_ring_buffer import CategoryRingBuffer
\ No newline at end of file
@@ -0,0 +1,52 @@
+import numpy as np
+
+from bot.data_source.categorizer import CATEGORIES
+
+
+class CategoryRingBuffer:
+    """
+    The latest capacity round categories, stored as int8 codes into CATEGORIES.
+
+    Every code is written twice, capacity apart, so the latest categories always lie contiguously in the buffer
+    and view returns them oldest first as a read-only slice, without copying or reallocating as rounds arrive.
+    """
+    def __init__(self, capacity: int):
+        if capacity < 1:
+            raise ValueError('capacity must be at least 1')
+        self.capacity = capacity
+        self.buffer = np.zeros(2 * capacity, dtype=np.int8)
+        self.rounds = 0
+
+    def append(self, code: int) -> None:
+        i = self.rounds % self.capacity
+        self.buffer[i] = code
+        self.buffer[i + self.capacity] = code
+        self.rounds += 1
+
+    def extend(self, codes) -> None:
+        """Appends the codes in order, writing only those that will still be in the buffer."""
+        skipped = max(len(codes) - self.capacity, 0)
+        self.rounds += skipped
+        for code in codes[skipped:]:
+            self.append(code)
+
+    def view(self) -> np.ndarray:
+        """Returns the latest categories' codes, oldest first, as a read-only view into the buffer."""
+        if self.rounds < self.capacity:
+            view = self.buffer[:self.rounds]
+        else:
+            start = self.rounds % self.capacity
+            view = self.buffer[start:start + self.capacity]
+        view = view.view()
+        view.flags.writeable = False
+        return view
+
+    def categories(self) -> list[str]:
+        """Returns the latest categories decoded to B, P and Pk, for predictors that take a list of strings."""
+        return [CATEGORIES[code] for code in self.view().tolist()]
+
+    def __len__(self) -> int:
+        return min(self.rounds, self.capacity)
+
+    def reset(self) -> None:
+        self.rounds = 0
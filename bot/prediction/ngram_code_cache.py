@@ -0,0 +1,107 @@
+import os
+import json
+from hashlib import sha256
+
+
+OFFLINE_NGRAM_CODE = '''from collections import defaultdict
+
+ORDER = {order}
+
+
+def build_ngrams(history, n):
+    ngrams = defaultdict(list)
+    for i in range(len(history) - n):
+        ngrams[tuple(history[i:i + n])].append(history[i + n])
+    return ngrams
+
+
+def next_share(history, category):
+    for n in range(min(ORDER, len(history) - 1), 0, -1):
+        possible = build_ngrams(history, n).get(tuple(history[-n:]), [])
+        if possible:
+            return possible.count(category) / len(possible)
+    return 0.0
+
+
+def predict_next_is_pk(history):
+    return next_share(history, 'Pk') > 0.5
+
+
+def predict_next_is_purple(history):
+    return next_share(history, 'P') > 0.5
+
+
+def predict_next_is_blue(history):
+    return next_share(history, 'B') > 0.5
+
+
+def recommend_next_category(history):
+    shares = {{category: next_share(history, category) for category in ('B', 'P', 'Pk')}}
+    return max(shares.items(), key=lambda x: x[1])[0] if any(shares.values()) else 'B'
+'''
+
+
+def generate_offline_ngram_code(order: int = 3) -> str:
+    """
+    Stands in for the code generator when running offline. Returns a prediction module that backs off from
+    order-grams to bigrams over the history it is given, so backtests can run without network access.
+    """
+    return OFFLINE_NGRAM_CODE.format(order=order)
+
+
+class NgramCodeCache:
+    """
+    Persistent cache of generated n-gram prediction modules, addressed by the sha256 of the category sequence and
+    the prompt version, so a sequence seen in an earlier backtest or session is not sent to the generator again.
+    Each entry is one file in the cache directory, which is created by the first put. Hits refresh the file's mtime,
+    and once more than max_entries are stored the least recently used entries are removed.
+    """
+    def __init__(self, directory: str = 'data/ngram_code_cache', prompt_version: int = 1, max_entries: int = 256):
+        self.directory = directory
+        self.prompt_version = prompt_version
+        self.max_entries = max_entries
+
+    def key(self, sequence: list[str]) -> str:
+        return sha256(json.dumps({'prompt_version': self.prompt_version, 'sequence': list(sequence)}).encode()).hexdigest()
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.directory, f'{key}.py')
+
+    def get(self, sequence: list[str]) -> str | None:
+        """Returns the cached code for the sequence, or None on a miss."""
+        path = self.path(self.key(sequence))
+        try:
+            with open(path) as f:
+                code = f.read()
+        except FileNotFoundError:
+            return None
+        os.utime(path)
+        return code
+
+    def put(self, sequence: list[str], code: str) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.path(self.key(sequence))
+        temporary_path = f'{path}.{os.getpid()}.tmp'
+        with open(temporary_path, 'w') as f:
+            f.write(code)
+        os.replace(temporary_path, path)
+        self.evict()
+
+    def evict(self) -> None:
+        """Removes the least recently used entries beyond max_entries, skipping entries another process removed."""
+        entries = []
+        for entry in os.scandir(self.directory):
+            if not entry.name.endswith('.py'):
+                continue
+            try:
+                entries.append((entry, entry.stat().st_mtime_ns))
+            except FileNotFoundError:
+                continue
+        if len(entries) <= self.max_entries:
+            return
+        entries.sort(key=lambda entry: entry[1])
+        for entry, _ in entries[:len(entries) - self.max_entries]:
+            try:
+                os.remove(entry.path)
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,142 @@
+from collections import deque
+
+import numpy as np
+
+from bot.data_source.categorizer import CATEGORIES
+
+
+class _Node:
+    __slots__ = ('children', 'counts', 'total')
+
+    def __init__(self):
+        self.children: dict[str, _Node] = {}
+        self.counts: dict[str, int] = {}
+        self.total = 0
+
+
+class NgramIndex:
+    """
+    Counts of the next category after every context of up to order categories, kept in a trie that is updated as
+    each category arrives instead of being rebuilt from the sequence on every prediction.
+
+    The trie is keyed by the context read backwards, from the latest category, so the node of a context of length k
+    is k lookups from the root and also holds the counts of all its shorter suffixes along the way. Predictions back
+    off to the longest suffix of the context that has been seen. With a window, only n-grams lying entirely within
+    the latest window categories are counted, the same as build_ngrams over history[-window:].
+
+    predict_next_is_pk, predict_next_is_purple, predict_next_is_blue and recommend_next_category follow the interface
+    of the generated ngram_predictions module, so an index can be used as the strategy's prediction module.
+    The history they take is only read for its context; the counts come from the categories given to update. It can
+    be a list of categories or the int8 category codes of CategoryRingBuffer.view, of which only the context is decoded.
+    """
+    def __init__(self, order: int = 2, window: int = None, states: tuple[str, ...] = ('B', 'P', 'Pk')):
+        if order < 1:
+            raise ValueError('order must be at least 1')
+        if window is not None and window <= order:
+            raise ValueError('window must be larger than order')
+        self.order = order
+        self.window = window
+        self.states = states
+        self.rounds = 0
+        self.history: deque[str] = deque(maxlen=order if window is None else None)
+        self.root = _Node()
+
+    def _count(self, context_end: int, length: int, state: str, change: int) -> None:
+        """Adds change to the count of state after the length categories of history ending before context_end."""
+        node = self.root
+        node.counts[state] = node.counts.get(state, 0) + change
+        node.total += change
+        for i in range(context_end - 1, context_end - 1 - length, -1):
+            node = node.children.setdefault(self.history[i], _Node())
+            node.counts[state] = node.counts.get(state, 0) + change
+            node.total += change
+
+    def update(self, state: str) -> None:
+        """Counts the new category after each of its preceding contexts, and expires n-grams leaving the window. O(order), or O(order²) with a window."""
+        self._count(len(self.history), min(self.order, len(self.history)), state, 1)
+        self.history.append(state)
+        self.rounds += 1
+        if self.window is not None and len(self.history) > self.window:
+            for length in range(min(self.order, len(self.history) - 1), 0, -1):
+                self._count_expired(length)
+            self.root.counts[self.history[0]] -= 1
+            self.root.total -= 1
+            self.history.popleft()
+
+    def _count_expired(self, length: int) -> None:
+        """Removes the n-gram whose context of the given length starts at the oldest category."""
+        node = self.root
+        for i in range(length - 1, -1, -1):
+            node = node.children[self.history[i]]
+        state = self.history[length]
+        node.counts[state] -= 1
+        node.total -= 1
+
+    def extend(self, states) -> None:
+        for state in states:
+            self.update(state)
+
+    def node(self, context: tuple[str, ...]) -> _Node | None:
+        """Returns the trie node of the context, or None if it has never been seen."""
+        node = self.root
+        for state in reversed(context):
+            node = node.children.get(state)
+            if node is None:
+                return None
+        return node
+
+    def counts(self, context: tuple[str, ...]) -> dict[str, int]:
+        """Returns the counts of each category seen right after the context."""
+        node = self.node(context)
+        return {state: node.counts.get(state, 0) if node else 0 for state in self.states}
+
+    def distribution(self, context: tuple[str, ...] = None) -> dict[str, float]:
+        """
+        Returns the probability of each next category after the context, by default the latest order categories.
+        Contexts longer than order are cut to their latest order categories. If the context has not been seen,
+        the longest seen suffix is used instead, down to the overall category frequencies.
+        """
+        context = tuple(self.history)[-self.order:] if context is None else tuple(context)[-self.order:]
+        node = self.root
+        best = self.root if self.root.total else None
+        for state in reversed(context):
+            node = node.children.get(state)
+            if node is None or not node.total:
+                break
+            best = node
+        if best is None:
+            return {state: 0 for state in self.states}
+        return {state: best.counts.get(state, 0) / best.total for state in self.states}
+
+    def context(self, history: list[str] | np.ndarray = None) -> tuple[str, ...] | None:
+        """Returns the latest order categories of a history of categories or of category codes."""
+        if history is None:
+            return None
+        context = history[-self.order:]
+        if isinstance(context, np.ndarray):
+            return tuple(CATEGORIES[code] for code in context.tolist())
+        return tuple(context)
+
+    def predict_next_is(self, state: str, history: list[str] | np.ndarray = None) -> bool:
+        """Whether the category is more likely than not to come next after the context ending the history."""
+        return self.distribution(self.context(history)).get(state, 0) > 0.5
+
+    def predict_next_is_pk(self, history: list[str] | np.ndarray = None) -> bool:
+        return self.predict_next_is('Pk', history)
+
+    def predict_next_is_purple(self, history: list[str] | np.ndarray = None) -> bool:
+        return self.predict_next_is('P', history)
+
+    def predict_next_is_blue(self, history: list[str] | np.ndarray = None) -> bool:
+        return self.predict_next_is('B', history)
+
+    def recommend_next_category(self, history: list[str] | np.ndarray = None) -> str:
+        distribution = self.distribution(self.context(history))
+        if not any(distribution.values()):
+            return 'B'
+        return max(distribution.items(), key=lambda item: item[1])[0]
+
+    def reset(self) -> None:
+        self.rounds = 0
+        self.history.clear()
+        self.root = _Node()
@@ -0,0 +1,69 @@
+from collections import deque
+
+
+class OnlineMarkovModel:
+    """
+    Markov transition counts that are updated as each state arrives, instead of being rebuilt from the whole history.
+    With order k, the next state is conditioned on the previous k states. With a window, only transitions whose states
+    all lie within the latest window states are counted, the same as building a model from history[-window:].
+
+    Each transition keeps the rounds it occurred in, so predictions list next states in order of first occurrence,
+    matching the dictionaries build_markov_model produces in the strategies.
+    """
+    def __init__(self, order: int = 1, window: int = None, states: tuple[str, ...] = ('B', 'P', 'Pk')):
+        if order < 1:
+            raise ValueError('order must be at least 1')
+        if window is not None and window <= order:
+            raise ValueError('window must be larger than order')
+        self.order = order
+        self.window = window
+        self.states = states
+        self.rounds = 0
+        self.history: deque[str] = deque(maxlen=order + 1 if window is None else None)
+        self.transitions: dict[tuple[str, ...], dict[str, deque[int]]] = {}
+        self.totals: dict[tuple[str, ...], int] = {}
+
+    def context(self) -> tuple[str, ...]:
+        """Returns the latest order states."""
+        return tuple(self.history[i] for i in range(max(len(self.history) - self.order, 0), len(self.history)))
+
+    def update(self, state: str) -> None:
+        """Adds the next state, and expires the oldest transition once the window is full. O(order)."""
+        context = self.context()
+        self.history.append(state)
+        if len(context) == self.order:
+            self.transitions.setdefault(context, {}).setdefault(state, deque()).append(self.rounds)
+            self.totals[context] = self.totals.get(context, 0) + 1
+        self.rounds += 1
+        if self.window is not None and len(self.history) > self.window:
+            expired = tuple(self.history[i] for i in range(self.order))
+            self._remove(expired, self.history[self.order])
+            self.history.popleft()
+
+    def _remove(self, context: tuple[str, ...], state: str) -> None:
+        occurrences = self.transitions[context]
+        occurrences[state].popleft()
+        if not occurrences[state]:
+            del occurrences[state]
+        self.totals[context] -= 1
+        if self.totals[context] == 0:
+            del self.transitions[context]
+            del self.totals[context]
+
+    def predict_next(self, context: tuple[str, ...] = None) -> dict[str, float]:
+        """
+        Returns the probability of each next state observed after the context, by default the latest order states.
+        An unseen context gives zero for every state, like markov_predict_next in the strategies.
+        """
+        context = self.context() if context is None else tuple(context)
+        if context not in self.transitions:
+            return {state: 0 for state in self.states}
+        total = self.totals[context]
+        occurrences = sorted(self.transitions[context].items(), key=lambda item: item[1][0])
+        return {state: len(rounds) / total for state, rounds in occurrences}
+
+    def reset(self) -> None:
+        self.rounds = 0
+        self.history.clear()
+        self.transitions.clear()
+        self.totals.clear()
@@ -0,0 +1,74 @@
+import os
+import types
+import logging
+from hashlib import sha256
+
+
+PREDICTION_FUNCTIONS = ('predict_next_is_pk', 'predict_next_is_purple', 'predict_next_is_blue')
+SAMPLE_HISTORY = ['B', 'P', 'Pk', 'B', 'B', 'P', 'B', 'Pk', 'P', 'B']
+
+
+class PredictionModuleLoader:
+    """
+    Loads a generated prediction module and reloads it only when the file changes.
+
+    Each load costs a stat call while the file's mtime and size are unchanged. When they change, the content hash is
+    compared with the loaded code, and only new content is compiled. New code is executed into a fresh module and
+    must define the prediction functions and answer a sample history without raising before it replaces the current
+    module; until then the previous module keeps being served. The module is compiled from the exact bytes that were
+    hashed, so a file rewritten during a load cannot leave a half-read module behind.
+    """
+    def __init__(self, path: str = 'ngram_predictions.py', module_name: str = 'ngram_predictions', required_functions: tuple[str, ...] = PREDICTION_FUNCTIONS):
+        self.path = path
+        self.module_name = module_name
+        self.required_functions = required_functions
+        self.module: types.ModuleType = None
+        self.file_signature: tuple[int, int] = None
+        self.content_hash: str = None
+        self.reloads = 0
+
+    def load(self) -> types.ModuleType:
+        """
+        Returns the current prediction module, reloading it first if the file holds new code.
+        Raises FileNotFoundError, or ImportError for invalid code, only while no module has been loaded yet.
+        """
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            if self.module is None:
+                raise FileNotFoundError("N-gram prediction module not found.")
+            return self.module
+        signature = (stat.st_mtime_ns, stat.st_size)
+        if signature == self.file_signature:
+            return self.module
+        with open(self.path, 'rb') as f:
+            source = f.read()
+        content_hash = sha256(source).hexdigest()
+        if content_hash == self.content_hash:
+            self.file_signature = signature
+            return self.module
+        try:
+            module = self.compile_module(source)
+        except Exception as e:
+            if self.module is None:
+                raise ImportError(f'Invalid prediction module {self.path}: {e}') from e
+            logging.warning(f'Keeping the current prediction module, {self.path} failed to load: {e}')
+            self.file_signature = signature
+            return self.module
+        self.module = module
+        self.file_signature = signature
+        self.content_hash = content_hash
+        self.reloads += 1
+        return self.module
+
+    def compile_module(self, source: bytes) -> types.ModuleType:
+        """Executes the source into a new module and checks that its prediction functions work."""
+        module = types.ModuleType(self.module_name)
+        module.__file__ = os.path.abspath(self.path)
+        exec(compile(source, module.__file__, 'exec'), module.__dict__)
+        for name in self.required_functions:
+            function = getattr(module, name, None)
+            if not callable(function):
+                raise ImportError(f'{name} is not defined')
+            function(list(SAMPLE_HISTORY))
+        return module
@@ -1,29 +1,33 @@
 import polars as pl
-from talipp.indicators import SMA
 
 from bot.strategy import BettingStrategy
 from bot.data_source import BetHistory, RoundResult
+from bot.indicators import IndicatorPipeline, SMA
 
 
 class SMACrossOver(BettingStrategy):
     slow_sma: int = 50
     fast_sma: int = 100
 
+    def register_indicators(self, indicators: IndicatorPipeline) -> None:
+        indicators.subscribe(f'sma_{self.slow_sma}', SMA(period=self.slow_sma))
+        indicators.subscribe(f'sma_{self.fast_sma}', SMA(period=self.fast_sma))
+
     def decide_multiplier(self, game_data: pl.DataFrame, bet_history: list[BetHistory] = [], restart_strategy: bool = False) -> float:
-        sma1 = SMA(period=self.slow_sma, input_values=list(game_data['multiplier']))
-        sma2 = SMA(period=self.fast_sma, input_values=list(game_data['multiplier']))
+        sma1 = self.indicators[f'sma_{self.slow_sma}']
+        sma2 = self.indicators[f'sma_{self.fast_sma}']
 
         # Check if we have enough data points to calculate SMA crossover
-        if len(sma1) < 2 or len(sma2) < 2:
+        if not sma1.ready or not sma2.ready:
             return 1.0  # Default multiplier if not enough data
 
         # Determine the crossover
-        if sma1[-1] > sma2[-1] and sma1[-2] <= sma2[-2]:
+        if sma1.crossed_above(sma2):
             # Fast SMA crosses above Slow SMA (Bullish signal)
             return 2.0  # Aggressive multiplier
-        elif sma1[-1] < sma2[-1] and sma1[-2] >= sma2[-2]:
+        elif sma1.crossed_below(sma2):
             # Fast SMA crosses below Slow SMA (Bearish signal)
             return 0.5  # Conservative multiplier
         else:
             # No crossover, maintain a neutral multiplier
-            return 1.0
\ No newline at end of file
+            return 1.0
@@ -2,9 +2,11 @@ from typing_extensions import Any
 import logging
 
 from pydantic import BaseModel, field_validator, ConfigDict
+import numpy as np
 import polars as pl
 
-from bot.data_source import BetHistory, LiveBetHistory, DecidedMultiplier
+from bot.data_source import BetHistory, LiveBetHistory, BetHistoryStore, DecidedMultiplier, BetStatistics
+from bot.indicators import IndicatorPipeline
 
 
 class BettingStrategy(BaseModel):
@@ -13,6 +15,9 @@ class BettingStrategy(BaseModel):
     percentage_to_bet_per_round_for_box_two: float
     is_backtest: bool = None
     log: logging.Logger = None
+    statistics: BetStatistics = None
+    clock: Any = None
+    indicators: IndicatorPipeline = None
 
     @field_validator('percentage_to_bet_per_round_for_box_one', 'percentage_to_bet_per_round_for_box_two')
     def check_limits(cls, value):
@@ -24,8 +29,32 @@ class BettingStrategy(BaseModel):
         """Override this method in specific strategy classes"""
         pass
 
-    def decide_multiplier(self, game_data: pl.DataFrame, bet_history: list[BetHistory | LiveBetHistory] = [], restart_strategy: bool = False) -> DecidedMultiplier:
-        """Override this method in specific strategy classes"""
+    def register_indicators(self, indicators: IndicatorPipeline) -> None:
+        """Override this method to subscribe to the streaming indicators the strategy reads, e.g. indicators.subscribe('sma_50', SMA(50))"""
+        pass
+
+    def decide_multiplier(self, game_data: pl.DataFrame, bet_history: BetHistoryStore = None, restart_strategy: bool = False) -> DecidedMultiplier:
+        """
+        Override this method in specific strategy classes.
+        The Backtester and Executor pass bet_history as a BetHistoryStore. Strategies that read its columns, e.g.
+        bet_history.multipliers, start with bet_history = self.bet_history_store(bet_history), so that a list of
+        records or no history at all also works.
+        """
+        raise NotImplementedError
+
+    @staticmethod
+    def bet_history_store(bet_history: BetHistoryStore | list[BetHistory | LiveBetHistory] | None) -> BetHistoryStore:
+        """Returns bet_history as a BetHistoryStore, building one when a list of records or None is given."""
+        if isinstance(bet_history, BetHistoryStore):
+            return bet_history
+        return BetHistoryStore.from_records(list(bet_history or []))
+
+    def decide_multipliers(self, game_data: pl.DataFrame) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Override this method in strategies that can decide every round at once, for vectorized backtests.
+        Returns the box one and box two multipliers for each round of game_data, where each decision
+        may only depend on the rounds before it.
+        """
         raise NotImplementedError
     
     def calculate_bet_amount_for_box_one(self, balance: float) -> float:
@@ -5,16 +5,16 @@ from time import sleep
 from datetime import datetime
 import queue
 import threading
-import json
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 import polars as pl
 from dotenv import load_dotenv
 
-from bot.data_source import DataSource, LiveBetHistory, IterationHistory, RoundResult, DecidedMultiplier
+from bot.data_source import DataSource, LiveBetHistory, BetHistoryStore, IterationHistory, RoundResult, DecidedMultiplier, BetStatistics, LiveBetHistoryWriter
 from bot.strategy.betting_strategy import BettingStrategy
 from bot.strategy.risk_manager import RiskManager
 from bot.casino import Casino
+from bot.indicators import IndicatorPipeline
 
 load_dotenv()
 
@@ -35,12 +35,16 @@ class Executor(BaseModel):
     look_back: int = 2
     start_time: str = '00:00:00'
     end_time: str = '23:59:59'
-    live_bet_history: list[LiveBetHistory] = []
+    live_bet_history: BetHistoryStore = Field(default_factory=lambda: BetHistoryStore(record_type=LiveBetHistory))
     consistent: bool = True
     continuous: bool = True
     iteration_history: list[IterationHistory] = []
+    statistics: BetStatistics = Field(default_factory=BetStatistics)
     iteration_wait_rounds: int = 0
-    live_bet_history_storage: str = f'live_bet_history/live_bet_history_{datetime.now().strftime("%Y%m%d_%H%M%S")}.json'
+    live_bet_history_storage: str = f'live_bet_history/live_bet_history_{datetime.now().strftime("%Y%m%d_%H%M%S")}.jsonl'
+    live_bet_history_writer: LiveBetHistoryWriter = None
+    saved_rounds: int = 0
+    indicators: IndicatorPipeline = Field(default_factory=IndicatorPipeline)
 
     def execute(self):
         logging.info('Logging in to casino')
@@ -56,8 +60,11 @@ class Executor(BaseModel):
         restart_strategy = False
         self.strategy.is_backtest = False
         self.strategy.log = logging
+        self.strategy.statistics = self.statistics
         self.casino.log = logging
         self.risk_manager.log = logging
+        self.strategy.indicators = self.indicators
+        self.strategy.register_indicators(self.indicators)
         self.strategy.introduce_strategy()
         iteration_wait_rounds_count = 0
         box_one_result_queue = queue.Queue()
@@ -69,112 +76,94 @@ class Executor(BaseModel):
         decided_multiplier = DecidedMultiplier(multiplier_for_box_one=1.0, multiplier_for_box_two=1.0)
         result_one = RoundResult.DRAW
         result_two = RoundResult.DRAW
-        while True:
-            try:
-                if restart_strategy and iteration_wait_rounds_count <= 0:
-                    self.casino.refresh()
-                if iteration_wait_rounds_count != 0:
-                    decided_multiplier = DecidedMultiplier(multiplier_for_box_one=1.0, multiplier_for_box_two=1.0)
-                    result_one = RoundResult.DRAW
-                    result_two = RoundResult.DRAW
-                    date = datetime.now().strftime('%Y-%m-%d')
-                    time = datetime.now().strftime('%H:%M:%S')
-                if len(self.casino.previous_multiplier_history) <= 0:
-                    self.casino.previous_multiplier_history = self.casino.get_latest_multipliers()
-                if self.casino.previous_multiplier_history != self.casino.get_latest_multipliers():
+        try:
+            while True:
+                try:
+                    if restart_strategy and iteration_wait_rounds_count <= 0:
+                        self.casino.refresh()
+                    if iteration_wait_rounds_count != 0:
+                        decided_multiplier = DecidedMultiplier(multiplier_for_box_one=1.0, multiplier_for_box_two=1.0)
+                        result_one = RoundResult.DRAW
+                        result_two = RoundResult.DRAW
+                        date = datetime.now().strftime('%Y-%m-%d')
+                        time = datetime.now().strftime('%H:%M:%S')
+                    snapshot = self.casino.take_snapshot()
+                    if len(self.casino.previous_multiplier_history) <= 0:
+                        self.casino.previous_multiplier_history = snapshot.multipliers
+                    if self.casino.previous_multiplier_history != snapshot.multipliers:
 
-                    if self.casino.previous_multiplier_history[:14] == self.casino.get_latest_multipliers()[1:]:
-                        latest_multiplier = self.casino.get_latest_multipliers()[0]
-                        if decided_multiplier.multiplier_for_box_one > 1.00 and result_one == RoundResult.LOSS and latest_multiplier >= decided_multiplier.multiplier_for_box_one:
-                            result_one = RoundResult.MISS
-                            decided_multiplier.multiplier_for_box_one = 1.00
-                        if decided_multiplier.multiplier_for_box_two > 1.00 and result_two == RoundResult.LOSS and latest_multiplier >= decided_multiplier.multiplier_for_box_two:
-                            result_two = RoundResult.MISS
-                            decided_multiplier.multiplier_for_box_two = 1.00
-                            
-                    if self.casino.previous_multiplier_history[:14] != self.casino.get_latest_multipliers()[1:]:
-                        previous_multiplier = self.casino.previous_multiplier_history[0]
-                        index_of_previous_multiplier_in_latest_multipliers = self.casino.get_latest_multipliers().index(previous_multiplier)
-                        latest_multiplier = self.casino.get_latest_multipliers()[0]
-                        current_balance = self.casino.get_balance()
-                        # if (decided_multiplier.multiplier_for_box_one > 1.00 and result_one == RoundResult.LOSS) or (decided_multiplier.multiplier_for_box_two > 1.00 and result_two == RoundResult.LOSS):
-                        logging.info(f'Multipliers: {self.casino.get_latest_multipliers()[:index_of_previous_multiplier_in_latest_multipliers]}')
-                        for multiplier in list(reversed(self.casino.get_latest_multipliers()[:index_of_previous_multiplier_in_latest_multipliers])):
-                            if multiplier >= decided_multiplier.multiplier_for_box_one:
+                        if self.casino.previous_multiplier_history[:14] == snapshot.multipliers[1:]:
+                            latest_multiplier = snapshot.multipliers[0]
+                            if decided_multiplier.multiplier_for_box_one > 1.00 and result_one == RoundResult.LOSS and latest_multiplier >= decided_multiplier.multiplier_for_box_one:
                                 result_one = RoundResult.MISS
-                            if multiplier >= decided_multiplier.multiplier_for_box_two:
-                                result_two = RoundResult.MISS
-                            if multiplier != latest_multiplier:
-                                self.live_bet_history.append(lvb := LiveBetHistory(
-                                    date=date,
-                                    time=time,
-                                    bet_amount_for_box_one=bet_amount_for_box_one,
-                                    bet_amount_for_box_two=bet_amount_for_box_two,
-                                    multiplier=(m := multiplier),
-                                    decided_multiplier=decided_multiplier,
-                                    result_one=result_one,
-                                    result_two=result_two,
-                                    initial_balance=initial_balance,
-                                    current_balance=current_balance,
-                                    multiplier_category='B' if 1.00 <= m <= 1.99 else 'P' if 2.00 <= m <= 9.99 else 'Pk',
-                                    decided_multiplier_one_category='B' if 1.00 <= decided_multiplier.multiplier_for_box_one <= 1.99 else 'P' if 2.00 <= decided_multiplier.multiplier_for_box_one <= 9.99 else 'Pk',
-                                    decided_multiplier_two_category='B' if 1.00 <= decided_multiplier.multiplier_for_box_two <= 1.99 else 'P' if 2.00 <= decided_multiplier.multiplier_for_box_two <= 9.99 else 'Pk',
-                                ))
-                                logging.info(lvb)
-                            if multiplier >= decided_multiplier.multiplier_for_box_one:
                                 decided_multiplier.multiplier_for_box_one = 1.00
-                            if multiplier >= decided_multiplier.multiplier_for_box_two:
+                            if decided_multiplier.multiplier_for_box_two > 1.00 and result_two == RoundResult.LOSS and latest_multiplier >= decided_multiplier.multiplier_for_box_two:
+                                result_two = RoundResult.MISS
                                 decided_multiplier.multiplier_for_box_two = 1.00
+                                
+                        if self.casino.previous_multiplier_history[:14] != snapshot.multipliers[1:]:
+                            previous_multiplier = self.casino.previous_multiplier_history[0]
+                            index_of_previous_multiplier_in_latest_multipliers = snapshot.multipliers.index(previous_multiplier)
+                            latest_multiplier = snapshot.multipliers[0]
+                            current_balance = snapshot.balance
+                            # if (decided_multiplier.multiplier_for_box_one > 1.00 and result_one == RoundResult.LOSS) or (decided_multiplier.multiplier_for_box_two > 1.00 and result_two == RoundResult.LOSS):
+                            logging.info(f'Multipliers: {snapshot.multipliers[:index_of_previous_multiplier_in_latest_multipliers]}')
+                            for multiplier in list(reversed(snapshot.multipliers[:index_of_previous_multiplier_in_latest_multipliers])):
+                                if multiplier >= decided_multiplier.multiplier_for_box_one:
+                                    result_one = RoundResult.MISS
+                                if multiplier >= decided_multiplier.multiplier_for_box_two:
+                                    result_two = RoundResult.MISS
+                                if multiplier != latest_multiplier:
+                                    self.live_bet_history.append_round(
+                                        date=date,
+                                        time=time,
+                                        bet_amount_for_box_one=bet_amount_for_box_one,
+                                        bet_amount_for_box_two=bet_amount_for_box_two,
+                                        multiplier=multiplier,
+                                        multiplier_for_box_one=decided_multiplier.multiplier_for_box_one,
+                                        multiplier_for_box_two=decided_multiplier.multiplier_for_box_two,
+                                        result_one=result_one,
+                                        result_two=result_two,
+                                        initial_balance=initial_balance,
+                                        current_balance=current_balance,
+                                    )
+                                    lvb = self.live_bet_history[-1]
+                                    logging.info(lvb)
+                                    self.statistics.update(lvb)
+                                    self.indicators.update(lvb.multiplier)
+                                if multiplier >= decided_multiplier.multiplier_for_box_one:
+                                    decided_multiplier.multiplier_for_box_one = 1.00
+                                if multiplier >= decided_multiplier.multiplier_for_box_two:
+                                    decided_multiplier.multiplier_for_box_two = 1.00
 
-                    self.casino.previous_multiplier_history = self.casino.get_latest_multipliers()
-                    current_balance = self.casino.get_balance()
-                    self.live_bet_history.append(lvb := LiveBetHistory(
-                        date=date,
-                        time=time,
-                        bet_amount_for_box_one=bet_amount_for_box_one,
-                        bet_amount_for_box_two=bet_amount_for_box_two,
-                        multiplier=(m := self.casino.get_latest_multipliers()[0]),
-                        decided_multiplier=decided_multiplier,
-                        result_one=result_one,
-                        result_two=result_two,
-                        initial_balance=initial_balance,
-                        current_balance=current_balance,
-                        multiplier_category='B' if 1.00 <= m <= 1.99 else 'P' if 2.00 <= m <= 9.99 else 'Pk',
-                        decided_multiplier_one_category='B' if 1.00 <= decided_multiplier.multiplier_for_box_one <= 1.99 else 'P' if 2.00 <= decided_multiplier.multiplier_for_box_one <= 9.99 else 'Pk',
-                        decided_multiplier_two_category='B' if 1.00 <= decided_multiplier.multiplier_for_box_two <= 1.99 else 'P' if 2.00 <= decided_multiplier.multiplier_for_box_two <= 9.99 else 'Pk',
-                    ))
-                    logging.info(lvb)
-                    self.save_live_bet_history()
-
-                    winnings_1 = [history for history in self.live_bet_history if history.result_one == RoundResult.WIN]
-                    winnings_2 = [history for history in self.live_bet_history if history.result_two == RoundResult.WIN]
-                    total_winnings = len(winnings_1) + len(winnings_2)
-                    logging.info(f'Total Number of Winnings: {total_winnings}')
+                        self.casino.previous_multiplier_history = snapshot.multipliers
+                        current_balance = snapshot.balance
+                        self.live_bet_history.append_round(
+                            date=date,
+                            time=time,
+                            bet_amount_for_box_one=bet_amount_for_box_one,
+                            bet_amount_for_box_two=bet_amount_for_box_two,
+                            multiplier=snapshot.multipliers[0],
+                            multiplier_for_box_one=decided_multiplier.multiplier_for_box_one,
+                            multiplier_for_box_two=decided_multiplier.multiplier_for_box_two,
+                            result_one=result_one,
+                            result_two=result_two,
+                            initial_balance=initial_balance,
+                            current_balance=current_balance,
+                        )
+                        lvb = self.live_bet_history[-1]
+                        logging.info(lvb)
+                        self.statistics.update(lvb)
+                        self.indicators.update(lvb.multiplier)
+                        self.save_live_bet_history()
+                        logging.info(f'Total Number of Winnings: {self.statistics.total_wins}')
 
-                    box_one_result_queue = queue.Queue()
-                    box_two_result_queue = queue.Queue()
-                    logging.info('Starting New Round!')
-                    self.data_source.load_data()
-                    if not self.risk_manager.check_risk(initial_balance, current_balance) and self.continuous:
-                        logging.info('Restarting strategy...')
-                        profit = (current_balance - initial_balance) if current_balance > initial_balance else 0.0
-                        loss = (initial_balance - current_balance) if initial_balance > current_balance else 0.0
-                        profit_percentage = (profit / initial_balance) * 100 if profit > 0 else 0.0
-                        loss_percentage = (loss / initial_balance) * 100 if loss > 0 else 0.0
-                        self.iteration_history.append(ih := IterationHistory(
-                            profit=profit,
-                            loss=loss,
-                            iteration=iteration,
-                            profit_percentage=profit_percentage,
-                            loss_percentage=loss_percentage
-                        ))
-                        logging.info(ih)
-                        restart_strategy = True
-                        initial_balance = current_balance
-                        self.risk_manager.balance_for_stop_loss = initial_balance
-                        iteration += 1
-                        iteration_wait_rounds_count = self.iteration_wait_rounds
-                    elif not self.risk_manager.check_risk(initial_balance, current_balance) and not self.continuous:
+                        box_one_result_queue = queue.Queue()
+                        box_two_result_queue = queue.Queue()
+                        logging.info('Starting New Round!')
+                        self.data_source.refresh()
+                        if not self.risk_manager.check_risk(initial_balance, current_balance) and self.continuous:
+                            logging.info('Restarting strategy...')
                             profit = (current_balance - initial_balance) if current_balance > initial_balance else 0.0
                             loss = (initial_balance - current_balance) if initial_balance > current_balance else 0.0
                             profit_percentage = (profit / initial_balance) * 100 if profit > 0 else 0.0
@@ -187,88 +176,109 @@ class Executor(BaseModel):
                                 loss_percentage=loss_percentage
                             ))
                             logging.info(ih)
-                    date = datetime.now().strftime('%Y-%m-%d')
-                    time = datetime.now().strftime('%H:%M:%S')
-                    historical_data = self.data_source.get_data_before_date_and_time(
-                        start_date=date,
-                        look_back=self.look_back,
-                    )
-                    if self.risk_manager.check_risk(initial_balance, current_balance) and iteration_wait_rounds_count <= 0:
-                        try:
-                            decided_multiplier: DecidedMultiplier = self.strategy.decide_multiplier(
-                                game_data=historical_data,
-                                bet_history=self.live_bet_history,
-                                restart_strategy=restart_strategy
-                            )
-                        except Exception as e:
-                            print(e)
-                            decided_multiplier = DecidedMultiplier(
-                                multiplier_for_box_one=1.00,
-                                multiplier_for_box_two=1.00
-                            )
+                            restart_strategy = True
+                            initial_balance = current_balance
+                            self.risk_manager.balance_for_stop_loss = initial_balance
+                            iteration += 1
+                            iteration_wait_rounds_count = self.iteration_wait_rounds
+                        elif not self.risk_manager.check_risk(initial_balance, current_balance) and not self.continuous:
+                                profit = (current_balance - initial_balance) if current_balance > initial_balance else 0.0
+                                loss = (initial_balance - current_balance) if initial_balance > current_balance else 0.0
+                                profit_percentage = (profit / initial_balance) * 100 if profit > 0 else 0.0
+                                loss_percentage = (loss / initial_balance) * 100 if loss > 0 else 0.0
+                                self.iteration_history.append(ih := IterationHistory(
+                                    profit=profit,
+                                    loss=loss,
+                                    iteration=iteration,
+                                    profit_percentage=profit_percentage,
+                                    loss_percentage=loss_percentage
+                                ))
+                                logging.info(ih)
+                        date = datetime.now().strftime('%Y-%m-%d')
+                        time = datetime.now().strftime('%H:%M:%S')
+                        historical_data = self.data_source.get_data_before_date_and_time(
+                            start_date=date,
+                            look_back=self.look_back,
+                        )
+                        if self.risk_manager.check_risk(initial_balance, current_balance) and iteration_wait_rounds_count <= 0:
+                            try:
+                                decided_multiplier: DecidedMultiplier = self.strategy.decide_multiplier(
+                                    game_data=historical_data,
+                                    bet_history=self.live_bet_history,
+                                    restart_strategy=restart_strategy
+                                )
+                            except Exception as e:
+                                print(e)
+                                decided_multiplier = DecidedMultiplier(
+                                    multiplier_for_box_one=1.00,
+                                    multiplier_for_box_two=1.00
+                                )
 
-                        logging.info(f'Box One Multiplier: {decided_multiplier.multiplier_for_box_one}')
-                        logging.info(f'Box Two Multiplier: {decided_multiplier.multiplier_for_box_two}')
+                            logging.info(f'Box One Multiplier: {decided_multiplier.multiplier_for_box_one}')
+                            logging.info(f'Box Two Multiplier: {decided_multiplier.multiplier_for_box_two}')
 
-                        adjusted_multiplier_for_box_one = self.adjust_for_latency(decided_multiplier.multiplier_for_box_one)
-                        adjusted_multiplier_for_box_two = self.adjust_for_latency(decided_multiplier.multiplier_for_box_two)
-                        bet_amount_for_box_one = self.strategy.calculate_bet_amount_for_box_one(balance=initial_balance if self.consistent else current_balance)
-                        bet_amount_for_box_two = self.strategy.calculate_bet_amount_for_box_two(balance=initial_balance if self.consistent else current_balance)
+                            adjusted_multiplier_for_box_one = self.adjust_for_latency(decided_multiplier.multiplier_for_box_one)
+                            adjusted_multiplier_for_box_two = self.adjust_for_latency(decided_multiplier.multiplier_for_box_two)
+                            bet_amount_for_box_one = self.strategy.calculate_bet_amount_for_box_one(balance=initial_balance if self.consistent else current_balance)
+                            bet_amount_for_box_two = self.strategy.calculate_bet_amount_for_box_two(balance=initial_balance if self.consistent else current_balance)
 
-                        if self.casino.__repr_name__() == 'Spribe' and bet_amount_for_box_one < 1.0:
-                            bet_amount_for_box_one = 1.0
-                        if self.casino.__repr_name__() == 'Spribe' and bet_amount_for_box_two < 1.0:
-                            bet_amount_for_box_two = 1.0
-                        if (self.casino.__repr_name__() == 'Sporty' or self.casino.__repr_name__() == 'MSport') and bet_amount_for_box_one < 10.0:
-                            bet_amount_for_box_one = 10.0
-                        if (self.casino.__repr_name__() == 'Sporty' or self.casino.__repr_name__() == 'MSport') and bet_amount_for_box_two < 10.0:
-                            bet_amount_for_box_two = 10.0
-                        cash_out_amount_1 = round(bet_amount_for_box_one * adjusted_multiplier_for_box_one, 2)
-                        cash_out_amount_2 = round(bet_amount_for_box_two * adjusted_multiplier_for_box_two, 2)
-                        result_one: RoundResult = RoundResult.DRAW
-                        result_two: RoundResult = RoundResult.DRAW
+                            if self.casino.__repr_name__() == 'Spribe' and bet_amount_for_box_one < 1.0:
+                                bet_amount_for_box_one = 1.0
+                            if self.casino.__repr_name__() == 'Spribe' and bet_amount_for_box_two < 1.0:
+                                bet_amount_for_box_two = 1.0
+                            if (self.casino.__repr_name__() == 'Sporty' or self.casino.__repr_name__() == 'MSport') and bet_amount_for_box_one < 10.0:
+                                bet_amount_for_box_one = 10.0
+                            if (self.casino.__repr_name__() == 'Sporty' or self.casino.__repr_name__() == 'MSport') and bet_amount_for_box_two < 10.0:
+                                bet_amount_for_box_two = 10.0
+                            cash_out_amount_1 = round(bet_amount_for_box_one * adjusted_multiplier_for_box_one, 2)
+                            cash_out_amount_2 = round(bet_amount_for_box_two * adjusted_multiplier_for_box_two, 2)
+                            result_one: RoundResult = RoundResult.DRAW
+                            result_two: RoundResult = RoundResult.DRAW
 
-                        if decided_multiplier.multiplier_for_box_one > 1.0:
-                            self.casino.place_bet_in_box_one(bet_amount_for_box_one)
-                        if decided_multiplier.multiplier_for_box_two > 1.0:
-                            self.casino.place_bet_in_box_two(bet_amount_for_box_two)
+                            if decided_multiplier.multiplier_for_box_one > 1.0:
+                                self.casino.place_bet_in_box_one(bet_amount_for_box_one)
+                            if decided_multiplier.multiplier_for_box_two > 1.0:
+                                self.casino.place_bet_in_box_two(bet_amount_for_box_two)
 
-                        def cash_out_box_one():
-                            result = self.casino.cash_out_box_one(cash_out_amount_1)
-                            box_one_result_queue.put(result)
-                        def cash_out_box_two():
-                            result = self.casino.cash_out_box_two(cash_out_amount_2)
-                            box_two_result_queue.put(result)
-                        threads: list[threading.Thread] = []
-                        if decided_multiplier.multiplier_for_box_one > 1.0:
-                            threads.append(threading.Thread(target=cash_out_box_one))
-                        if decided_multiplier.multiplier_for_box_two > 1.0:
-                            threads.append(threading.Thread(target=cash_out_box_two))
-                        for thread in threads:
-                            thread.start()
-                        for thread in threads:
-                            thread.join()
-                        if decided_multiplier.multiplier_for_box_one > 1.0:
-                            result_one = box_one_result_queue.get()
-                        if decided_multiplier.multiplier_for_box_two > 1.0:
-                            result_two = box_two_result_queue.get()
-                        restart_strategy = False
-                    else:
-                        iteration_wait_rounds_count -= 1
-                        logging.info(f'Waiting for {iteration_wait_rounds_count} of {self.iteration_wait_rounds} rounds to place a bet')
-            except Exception as e:
-                print(f'Error during execution: {e}')
-                self.casino.refresh()
+                            def cash_out_box_one():
+                                result = self.casino.cash_out_box_one(cash_out_amount_1)
+                                box_one_result_queue.put(result)
+                            def cash_out_box_two():
+                                result = self.casino.cash_out_box_two(cash_out_amount_2)
+                                box_two_result_queue.put(result)
+                            threads: list[threading.Thread] = []
+                            if decided_multiplier.multiplier_for_box_one > 1.0:
+                                threads.append(threading.Thread(target=cash_out_box_one))
+                            if decided_multiplier.multiplier_for_box_two > 1.0:
+                                threads.append(threading.Thread(target=cash_out_box_two))
+                            for thread in threads:
+                                thread.start()
+                            for thread in threads:
+                                thread.join()
+                            if decided_multiplier.multiplier_for_box_one > 1.0:
+                                result_one = box_one_result_queue.get()
+                            if decided_multiplier.multiplier_for_box_two > 1.0:
+                                result_two = box_two_result_queue.get()
+                            restart_strategy = False
+                        else:
+                            iteration_wait_rounds_count -= 1
+                            logging.info(f'Waiting for {iteration_wait_rounds_count} of {self.iteration_wait_rounds} rounds to place a bet')
+                except Exception as e:
+                    print(f'Error during execution: {e}')
+                    self.casino.refresh()
+        finally:
+            if self.live_bet_history_writer is not None:
+                self.live_bet_history_writer.close()
 
     def save_live_bet_history(self) -> None:
+        """Appends the rounds recorded since the last save to the live bet history file."""
         try:
-            with open(self.live_bet_history_storage, 'w') as file:
-                json.dump(
-                    [history.model_dump() | {"result_one": str(history.result_one.value), "result_two": str(history.result_two.value)} for history in self.live_bet_history],
-                    file,
-                    indent=4
-                )
-                logging.info(f'Live bet history saved to {self.live_bet_history_storage}')
+            if self.live_bet_history_writer is None:
+                self.live_bet_history_writer = LiveBetHistoryWriter(self.live_bet_history_storage)
+            for history in self.live_bet_history[self.saved_rounds:]:
+                self.live_bet_history_writer.write(history)
+            self.saved_rounds = len(self.live_bet_history)
+            logging.info(f'Live bet history saved to {self.live_bet_history_storage}')
         except Exception as e:
             print(f'Failed to save live bet history: {e}')
 
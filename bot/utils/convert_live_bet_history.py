@@ -0,0 +1,32 @@
+import os
+import sys
+import json
+
+from bot.data_source import read_live_bet_history
+
+
+def convert_live_bet_history(bet_history_file: str, output_file: str = None) -> str:
+    """
+    Converts a live bet history between the append-only JSONL format and the JSON array format.
+    The output is written to a temporary file first and moved into place, so a failed conversion leaves no partial file.
+    :param bet_history_file: Path to the .jsonl or .json file.
+    :param output_file: Path to write to, by default the input path with the other extension.
+    :return: Path of the converted file.
+    """
+    if output_file is None:
+        stem, extension = os.path.splitext(bet_history_file)
+        output_file = stem + ('.json' if extension == '.jsonl' else '.jsonl')
+    bet_history = read_live_bet_history(bet_history_file)
+    temporary_file = f"{output_file}.tmp"
+    if output_file.endswith('.jsonl'):
+        bet_history.write_ndjson(temporary_file)
+    else:
+        with open(temporary_file, 'w') as file:
+            json.dump(bet_history.to_dicts(), file, indent=4)
+    os.replace(temporary_file, output_file)
+    print(f"Converted {len(bet_history)} rounds from {bet_history_file} to {output_file}")
+    return output_file
+
+
+if __name__ == '__main__':
+    convert_live_bet_history(sys.argv[1], sys.argv[2] if len(sys.argv) > 2 else None)
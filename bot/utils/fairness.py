@@ -0,0 +1,86 @@
+import os
+import hashlib
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import polars as pl
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+
+SEED_COLUMNS = ['server_seed', 'player_seed_1', 'player_seed_2', 'player_seed_3', 'stored_hash']
+
+
+def crash_point(stored_hash: str, house_edge: float = 0.03, maximum_multiplier: float = None) -> float:
+    """
+    Derives a round's multiplier from its SHA-512 hash. The first 13 hex digits give a uniform u in [0, 1), and the
+    multiplier is (1 - house_edge) / (1 - u) cut to two decimals, at least 1.00 and at most maximum_multiplier.
+    """
+    return float(crash_points(np.array([int(stored_hash[:13], 16)], dtype=np.int64), house_edge, maximum_multiplier)[0])
+
+
+def crash_points(hash_ints: np.ndarray, house_edge: float = 0.03, maximum_multiplier: float = None) -> np.ndarray:
+    """Vectorized crash_point over the integers of the first 13 hex digits of each hash."""
+    u = hash_ints / float(1 << 52)
+    multipliers = np.maximum(np.floor(100 * (1.0 - house_edge) / (1.0 - u)) / 100, 1.00)
+    if maximum_multiplier is not None:
+        multipliers = np.minimum(multipliers, maximum_multiplier)
+    return multipliers
+
+
+def verify_rounds(rounds: pl.DataFrame, house_edge: float = 0.03) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Checks a batch of rounds with the seed and hash columns of the rounds CSV. The seeds are concatenated and the
+    hash prefixes parsed by Polars, leaving only the SHA-512 itself to Python.
+    :return: Whether each recomputed hash matches the stored hash, and the multiplier crash_point derives from each stored hash.
+    """
+    sha512 = hashlib.sha512
+    combined_strings = rounds.select(pl.concat_str(SEED_COLUMNS[:4]).alias('combined_string'))['combined_string'].to_list()
+    computed_hashes = pl.Series([sha512(combined_string.encode()).hexdigest() for combined_string in combined_strings], dtype=pl.String)
+    fair = (computed_hashes == rounds['stored_hash']).fill_null(False).to_numpy()
+    hash_ints = rounds.select(pl.col('stored_hash').str.slice(0, 13).str.to_integer(base=16))['stored_hash'].to_numpy()
+    return fair, crash_points(hash_ints, house_edge)
+
+
+def verify_row_group(parquet_file: str, row_group: int, house_edge: float = 0.03) -> tuple[np.ndarray, np.ndarray]:
+    """Reads the seed and hash columns of one row group of a rounds Parquet file and checks its rounds with verify_rounds."""
+    return verify_rounds(pl.from_arrow(pq.ParquetFile(parquet_file).read_row_group(row_group, columns=SEED_COLUMNS)), house_edge)
+
+
+def verify_parquet(parquet_file: str, house_edge: float = 0.03, max_workers: int = None) -> int:
+    """
+    Verifies every round of a Parquet file written by RoundStore and rewrites it with a `fair` column and a
+    `recomputed_multiplier` column, keeping its metadata so the store stays fresh.
+
+    Worker processes read and check one row group each, so only the two result columns cross process boundaries.
+    The file is streamed back row group by row group in order, with at most two row groups per worker in flight.
+    :return: Number of rounds verified.
+    """
+    max_workers = max_workers or os.cpu_count()
+    source = pq.ParquetFile(parquet_file)
+    schema = source.schema_arrow
+    for name in ('fair', 'recomputed_multiplier'):
+        if name in schema.names:
+            schema = schema.remove(schema.get_field_index(name))
+    columns = schema.names
+    schema = schema.append(pa.field('fair', pa.bool_())).append(pa.field('recomputed_multiplier', pa.float64()))
+    temporary_file = f'{parquet_file}.tmp'
+    rounds = 0
+
+    def write(writer: pq.ParquetWriter, row_group: int, future) -> None:
+        fair, recomputed_multipliers = future.result()
+        table = source.read_row_group(row_group, columns=columns)
+        writer.write_table(pa.Table.from_arrays([*table.columns, pa.array(fair), pa.array(recomputed_multipliers)], schema=schema))
+
+    with pq.ParquetWriter(temporary_file, schema) as writer, ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context('spawn')) as executor:
+        pending = []
+        for row_group in range(source.num_row_groups):
+            pending.append((row_group, executor.submit(verify_row_group, parquet_file, row_group, house_edge)))
+            rounds += source.metadata.row_group(row_group).num_rows
+            if len(pending) >= 2 * max_workers:
+                write(writer, *pending.pop(0))
+        for row_group, future in pending:
+            write(writer, row_group, future)
+    os.replace(temporary_file, parquet_file)
+    return rounds
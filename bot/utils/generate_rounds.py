@@ -0,0 +1,126 @@
+import os
+import sys
+import string
+import hashlib
+import multiprocessing
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import polars as pl
+
+from bot.utils.fairness import crash_points
+
+
+SEED_ALPHABET = string.ascii_letters + string.digits
+SEED_TABLE = bytes(ord(SEED_ALPHABET[i % len(SEED_ALPHABET)]) for i in range(256))
+
+
+def seed(master_seed: str, label: str, length: int) -> str:
+    """Derives a seed of the given length (at most 64) from the master seed, in the alphabet of the recorded seeds."""
+    return hashlib.sha512(f'{master_seed}:{label}'.encode()).digest()[:length].translate(SEED_TABLE).decode()
+
+
+def generate_chunk(
+    first_round: int,
+    rounds: int,
+    master_seed: str,
+    start: datetime,
+    interval_seconds: int,
+    house_edge: float,
+    maximum_multiplier: float,
+) -> pl.DataFrame:
+    """
+    Generates rounds first_round to first_round + rounds - 1 in the column order of the rounds CSV.
+    Every value depends only on the master seed and the round number, so chunks can be generated in any process.
+    """
+    server_seeds, player_seeds_1, player_seeds_2, player_seeds_3, stored_hashes = [], [], [], [], []
+    hash_ints = np.empty(rounds, dtype=np.int64)
+    for i, game_round in enumerate(range(first_round, first_round + rounds)):
+        server_seed = seed(master_seed, f'{game_round}:server', 40)
+        player_seed_1 = seed(master_seed, f'{game_round}:player_1', 20)
+        player_seed_2 = seed(master_seed, f'{game_round}:player_2', 20)
+        player_seed_3 = seed(master_seed, f'{game_round}:player_3', 20)
+        stored_hash = hashlib.sha512((server_seed + player_seed_1 + player_seed_2 + player_seed_3).encode()).hexdigest()
+        server_seeds.append(server_seed)
+        player_seeds_1.append(player_seed_1)
+        player_seeds_2.append(player_seed_2)
+        player_seeds_3.append(player_seed_3)
+        stored_hashes.append(stored_hash)
+        hash_ints[i] = int(stored_hash[:13], 16)
+    offsets = np.arange(first_round, first_round + rounds, dtype=np.int64) * interval_seconds
+    timestamps = pl.Series(offsets * 1_000_000).cast(pl.Duration('us')) + start
+    return pl.DataFrame({
+        'game_round': np.arange(first_round, first_round + rounds, dtype=np.int64),
+        'date': timestamps.dt.to_string('%Y-%m-%d'),
+        'time': timestamps.dt.to_string('%H:%M:%S'),
+        'server_seed': server_seeds,
+        'player_seed_1': player_seeds_1,
+        'player_seed_2': player_seeds_2,
+        'player_seed_3': player_seeds_3,
+        'stored_hash': stored_hashes,
+        'multiplier': crash_points(hash_ints, house_edge, maximum_multiplier),
+    })
+
+
+def _generate_chunk(arguments: tuple) -> pl.DataFrame:
+    return generate_chunk(*arguments)
+
+
+def generate_rounds(
+    output_file: str,
+    rounds: int,
+    master_seed: str = 'aviator',
+    start: str = '2025-01-01 00:00:00',
+    interval_seconds: int = 12,
+    first_round: int = 1,
+    house_edge: float = 0.03,
+    maximum_multiplier: float = None,
+    chunk_size: int = 100_000,
+    max_workers: int = None,
+) -> None:
+    """
+    Generates provably fair rounds and writes them as a headerless CSV in the layout of sporty_aviator_data.csv.
+
+    Each round's seeds are derived from the master seed and the round number, its hash is the SHA-512 of the server
+    seed followed by the three player seeds, as checked by bot.utils.verify_fairness, and its multiplier is the
+    crash_point of the hash. Chunks are generated in worker processes and appended to the CSV in round order as they
+    finish, with at most two chunks per worker in flight, so memory stays flat however many rounds are written.
+    :param output_file: CSV file to write. An existing file is replaced.
+    :param rounds: Number of rounds to generate.
+    :param master_seed: Seed every round is derived from. The same seed always gives the same rounds.
+    :param start: Date and time of round 0; round n is played n * interval_seconds later.
+    :param house_edge: Share of the fair multiplier the house keeps.
+    :param maximum_multiplier: Optional cap on the multiplier.
+    """
+    start = datetime.strptime(start, '%Y-%m-%d %H:%M:%S')
+    chunks = [
+        (chunk_start, min(chunk_size, first_round + rounds - chunk_start), master_seed, start, interval_seconds, house_edge, maximum_multiplier)
+        for chunk_start in range(first_round, first_round + rounds, chunk_size)
+    ]
+    max_workers = max_workers or os.cpu_count()
+    temporary_file = f'{output_file}.tmp'
+    with open(temporary_file, 'wb') as file, ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context('spawn')) as executor:
+        pending = []
+        for chunk in chunks:
+            pending.append(executor.submit(_generate_chunk, chunk))
+            if len(pending) >= 2 * max_workers:
+                pending.pop(0).result().write_csv(file, include_header=False)
+        for future in pending:
+            future.result().write_csv(file, include_header=False)
+    os.replace(temporary_file, output_file)
+
+
+if __name__ == '__main__':
+    # Usage: python -m bot.utils.generate_rounds output.csv rounds [master_seed] [max_workers] [house_edge] [maximum_multiplier]
+    output_file, rounds = sys.argv[1], int(sys.argv[2])
+    started = datetime.now()
+    generate_rounds(
+        output_file,
+        rounds,
+        master_seed=sys.argv[3] if len(sys.argv) > 3 else 'aviator',
+        max_workers=int(sys.argv[4]) if len(sys.argv) > 4 else None,
+        house_edge=float(sys.argv[5]) if len(sys.argv) > 5 else 0.03,
+        maximum_multiplier=float(sys.argv[6]) if len(sys.argv) > 6 else None,
+    )
+    print(f'Generated {rounds} rounds in {output_file} in {datetime.now() - started}')
@@ -1,6 +1,12 @@
+import os
+import sys
 import csv
+import time
 import hashlib
 
+from bot.utils.fairness import verify_parquet
+
+
 def verify_fairness(data_row):
     """
     Verifies if the game result is fair by recomputing the hash and checking if it matches the stored hash.
@@ -38,8 +44,33 @@ def verify_multiplier(data_row):
 
 
 if __name__ == '__main__':
-    with open('sporty_aviator_data.csv', 'r', newline='') as file:
-        reader = csv.reader(file)
+    arg = sys.argv[1] if len(sys.argv) > 1 else 'rows'
+    if arg == 'rows':
+        with open('sporty_aviator_data.csv', 'r', newline='') as file:
+            rows = list(csv.reader(file))
 
-        print(f"Number of fair games: {sum(verify_fairness(row) for row in reader)}")
-        print(f"Number of correct multipliers: {sum(verify_multiplier(row) for row in reader)}")
\ No newline at end of file
+        print(f"Number of fair games: {sum(verify_fairness(row) for row in rows)}")
+        print(f"Number of correct multipliers: {sum(verify_multiplier(row) for row in rows)}")
+    elif arg == 'bulk':
+        from bot.data_source.round_store import RoundStore
+        store = RoundStore(sys.argv[2] if len(sys.argv) > 2 else 'sporty_aviator_data.csv')
+        store.verify()
+        fair = store.scan().select('fair').collect()['fair']
+        print(f"Number of fair games: {fair.sum()} of {len(fair)}")
+    elif arg == 'benchmark':
+        # Usage: python -m bot.utils.verify_fairness benchmark rounds.csv [max_workers]
+        from bot.data_source.round_store import RoundStore
+        csv_file = sys.argv[2] if len(sys.argv) > 2 else 'sporty_aviator_data.csv'
+        max_workers = int(sys.argv[3]) if len(sys.argv) > 3 else None
+        store = RoundStore(csv_file)
+        store.scan()
+        start = time.perf_counter()
+        with open(csv_file, 'r', newline='') as file:
+            rows = list(csv.reader(file))
+        fair_rows = sum(verify_fairness(row) for row in rows)
+        row_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        rounds = verify_parquet(store.parquet_file, max_workers=max_workers)
+        bulk_seconds = time.perf_counter() - start
+        print(f"Row by row: {len(rows)} rows in {row_seconds:.2f} s, {len(rows) / row_seconds:,.0f} rows/s, {fair_rows} fair")
+        print(f"Bulk: {rounds} rows in {bulk_seconds:.2f} s, {rounds / bulk_seconds:,.0f} rows/s with {max_workers or os.cpu_count()} workers")
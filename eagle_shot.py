@@ -1,12 +1,16 @@
 import sys
 import polars as pl
+from pydantic import Field
 
 from bot.backtesting.backtest import Backtester
+from bot.backtesting.sweep import lazy_data_source, run_sweep_command
+from bot.backtesting.session_replay import SessionReplay, SESSION_PATTERNS
+from bot.backtesting.result_cache import BacktestResultCache
 from bot.casino import Spribe, Sporty, MSport
-from bot.data_source import DataSource
 from bot.data_source import DecidedMultiplier
+from bot.indicators import BlueDebtTracker, scan_debts, track_debts
 from bot.strategy import BettingStrategy
-from bot.data_source import BetHistory, RoundResult, LiveBetHistory
+from bot.data_source import BetHistory, BetHistoryStore, RoundResult, LiveBetHistory
 from bot.strategy.executor import Executor
 from bot.strategy.risk_manager import RiskManager
 
@@ -22,6 +26,7 @@ class EagleShot(BettingStrategy):
         multiplier_for_box_two=1.00,
     )
     start_index: int = 0
+    debt_tracker: BlueDebtTracker = Field(default=None, exclude=True)
 
     def introduce_strategy(self):
         self.log.info(f"""
@@ -58,37 +63,24 @@ class EagleShot(BettingStrategy):
         Returns:
             list of float: List of target multipliers needed to resolve unpaid Blue debts.
         """
-        targets = []
-        i = 0
-        while i < len(multipliers):
-            current = multipliers[i]
-            
-            if lower_bound <= current < upper_bound:
-                # Start a debt sequence
-                target = initial_target  # Initial target: 100% profit
-                resolved = False
-                for j in range(i + 1, len(multipliers)):
-                    if multipliers[j] >= target:
-                        resolved = True
-                        break
-                    else:
-                        target = round(target + increment, 2)  # Increase target by +100%
-                if not resolved:
-                    targets.append(target)
-            
-            i += 1
-
-        return targets
+        return scan_debts(multipliers, initial_target, lower_bound, upper_bound, increment)
     
     def sort(self, multipliers: list[float], minimum_multiplier: float = 10.00) -> list[float]:
         filtered_multipliers = [m for m in multipliers if m >= minimum_multiplier]
         return sorted(filtered_multipliers)
 
-    def decide_multiplier(self, game_data: pl.DataFrame, bet_history: list[BetHistory | LiveBetHistory] = [], restart_strategy: bool = False) -> DecidedMultiplier:
-        multipliers = [history.multiplier for history in bet_history]
-        target_multipliers = self.scanner(multipliers, self.initial_target_multiplier, self.lower_bound, self.upper_bound, self.increment)
-        if len(target_multipliers) > 0:
-            sorted_multipliers = self.sort(target_multipliers, self.minimum_multiplier)
+    def decide_multiplier(self, game_data: pl.DataFrame, bet_history: BetHistoryStore = None, restart_strategy: bool = False) -> DecidedMultiplier:
+        bet_history = self.bet_history_store(bet_history)
+        debt_tracker = self.debt_tracker = track_debts(
+            self.debt_tracker,
+            bet_history.multipliers,
+            self.initial_target_multiplier,
+            self.lower_bound,
+            self.upper_bound,
+            self.increment,
+        )
+        if len(debt_tracker.open_debts) > 0:
+            sorted_multipliers = debt_tracker.sorted_targets(self.minimum_multiplier)
             self.log.info(f'Sorted Target Multipliers: {sorted_multipliers}')
             decided_multiplier = DecidedMultiplier(
                 multiplier_for_box_one=1.00,
@@ -123,11 +115,16 @@ strategy = EagleShot(
     increment=1.00
 )
 risk_manager = RiskManager(stop_loss=1.0, take_profit=0.05)
-data_source = DataSource(csv_file="sporty_aviator_data.csv")
 test_casino = Spribe()
 live_casino = MSport()
 
+
+__getattr__ = lazy_data_source(__name__, 'sporty_aviator_data.csv')
+
+
 if __name__ == '__main__':
+    data_source = __getattr__('data_source')
+    result_cache = BacktestResultCache()
     arg = sys.argv[1]
     if arg == 'live':
         executor = Executor(
@@ -159,6 +156,7 @@ if __name__ == '__main__':
             start_date='2025-03-23',
             initial_balance=40000,
             iteration_wait_rounds=10,
+            result_cache=result_cache,
             # continuous=False,
             # consistent=False,
             # live_bet_history_file='live_bet_history/live_bet_history_20250415_125629.json', # 2025-04-15 Sporty
@@ -183,3 +181,34 @@ if __name__ == '__main__':
             # live_bet_history_file='artificial_live_bet_history/live_bet_history.json'
         )
         backester.run()
+    elif arg in ('sweep', 'walk-forward'):
+        run_sweep_command(
+            arg,
+            strategy=strategy,
+            risk_manager=risk_manager,
+            data_source=data_source,
+            parameter_grid={
+                'minimum_multiplier': [5.00, 10.00, 20.00],
+                'upper_bound': [2.00, 2.30, 3.00],
+                'increment': [0.50, 1.00],
+            },
+            backtest_parameters={
+                'start_date': '2025-03-23',
+                'initial_balance': 40000,
+                'iteration_wait_rounds': 10,
+                'result_cache': result_cache,
+            },
+        )
+    elif arg == 'replay':
+        replay = SessionReplay(
+            strategy=strategy,
+            risk_manager=risk_manager,
+            patterns=sys.argv[2:] or SESSION_PATTERNS,
+            backtest_parameters={
+                'iteration_wait_rounds': 10,
+            },
+        )
+        results = replay.run()
+        with pl.Config(tbl_rows=-1, tbl_cols=-1):
+            print(results)
+            print(replay.summarize(results))
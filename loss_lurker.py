@@ -1,9 +1,12 @@
 import sys
 import polars as pl
+from pydantic import Field
 
 from bot.backtesting.backtest import Backtester
+from bot.backtesting.sweep import lazy_data_source, run_sweep_command
+from bot.backtesting.session_replay import SessionReplay, SESSION_PATTERNS
+from bot.backtesting.result_cache import BacktestResultCache
 from bot.casino import Spribe, Sporty, MSport
-from bot.data_source import DataSource
 from bot.data_source import DecidedMultiplier
 from bot.strategy import BettingStrategy
 from bot.data_source import BetHistory, RoundResult, LiveBetHistory
@@ -12,9 +15,12 @@ from bot.strategy.risk_manager import RiskManager
 
 
 class LossLurker(BettingStrategy):
-    base_decided_multiplier: DecidedMultiplier = DecidedMultiplier(
-        multiplier_for_box_one=1.00,
-        multiplier_for_box_two=1.00,
+    base_decided_multiplier: DecidedMultiplier = Field(
+        default=DecidedMultiplier(
+            multiplier_for_box_one=1.00,
+            multiplier_for_box_two=1.00,
+        ),
+        exclude=True,
     )
 
     def get_divider(self, total_multiplier: float) -> float:
@@ -77,11 +83,16 @@ class LossLurker(BettingStrategy):
 
 strategy = LossLurker(percentage_to_bet_per_round_for_box_one=0.0005, percentage_to_bet_per_round_for_box_two=0.00075)
 risk_manager = RiskManager(stop_loss=1.0, take_profit=0.05)
-data_source = DataSource(csv_file="sporty_aviator_data.csv")
 test_casino = Spribe()
 live_casino = MSport()
 
+
+__getattr__ = lazy_data_source(__name__, 'sporty_aviator_data.csv')
+
+
 if __name__ == '__main__':
+    data_source = __getattr__('data_source')
+    result_cache = BacktestResultCache()
     arg = sys.argv[1]
     if arg == 'live':
         executor = Executor(
@@ -113,6 +124,7 @@ if __name__ == '__main__':
             start_date='2025-03-28',
             initial_balance=29004.8,
             iteration_wait_rounds=10,
+            result_cache=result_cache,
             # continuous=False,
             # consistent=False,
             # live_bet_history_file='live_bet_history/live_bet_history_20250415_125629.json', # 2025-04-15 Sporty
@@ -137,3 +149,33 @@ if __name__ == '__main__':
             # live_bet_history_file='artificial_live_bet_history/live_bet_history.json'
         )
         backester.run()
+    elif arg in ('sweep', 'walk-forward'):
+        run_sweep_command(
+            arg,
+            strategy=strategy,
+            risk_manager=risk_manager,
+            data_source=data_source,
+            parameter_grid={
+                'percentage_to_bet_per_round_for_box_one': [0.00025, 0.0005, 0.001],
+                'percentage_to_bet_per_round_for_box_two': [0.0005, 0.00075, 0.001],
+            },
+            backtest_parameters={
+                'start_date': '2025-03-28',
+                'initial_balance': 29004.8,
+                'iteration_wait_rounds': 10,
+                'result_cache': result_cache,
+            },
+        )
+    elif arg == 'replay':
+        replay = SessionReplay(
+            strategy=strategy,
+            risk_manager=risk_manager,
+            patterns=sys.argv[2:] or SESSION_PATTERNS,
+            backtest_parameters={
+                'iteration_wait_rounds': 10,
+            },
+        )
+        results = replay.run()
+        with pl.Config(tbl_rows=-1, tbl_cols=-1):
+            print(results)
+            print(replay.summarize(results))
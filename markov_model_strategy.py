@@ -1,12 +1,15 @@
 from collections import Counter, defaultdict
 import random
 import sys
+import numpy as np
 import polars as pl
+from pydantic import Field
 
 from bot.backtesting.backtest import Backtester
 from bot.casino.sporty import Sporty
 from bot.casino.spribe import Spribe
 from bot.data_source import DataSource, DecidedMultiplier
+from bot.prediction import OnlineMarkovModel
 from bot.strategy import BettingStrategy
 from bot.data_source import BetHistory, RoundResult, LiveBetHistory
 from bot.strategy.executor import Executor
@@ -17,13 +20,15 @@ class MarkovModelStrategy(BettingStrategy):
     lookback_window: int = 8
     base_multiplier_for_box_one: float = 5.00
     base_multiplier_for_box_two: float = 3.00
+    markov_model: OnlineMarkovModel = Field(default=None, exclude=True)
 
     def introduce_strategy(self):
         self.log.info(f"""
         Strategy: {self.__repr_name__()}
         Description: A strategy using Markov chains for game prediction.
         Is Backtest? {self.is_backtest}
-        Percentage to bet per round: {self.percentage_to_bet_per_round}
+        Percentage to bet per round in box one: {self.percentage_to_bet_per_round_for_box_one}
+        Percentage to bet per round in box two: {self.percentage_to_bet_per_round_for_box_two}
         Lookback window: {self.lookback_window}
         Base multiplier for box one: {self.base_multiplier_for_box_one}
         Base multiplier for box two: {self.base_multiplier_for_box_two}
@@ -56,6 +61,14 @@ class MarkovModelStrategy(BettingStrategy):
         current_state = history[-1]
         markov_probs = self.markov_predict_next(markov_model, current_state)
         return markov_probs
+
+    def predict_from_bet_history(self, bet_history: list[BetHistory | LiveBetHistory]) -> dict[str, float]:
+        """Feeds the rounds recorded since the last call to the online Markov model and predicts the next category."""
+        if self.markov_model is None or len(bet_history) < self.markov_model.rounds:
+            self.markov_model = OnlineMarkovModel(window=self.lookback_window)
+        for history in bet_history[self.markov_model.rounds:]:
+            self.markov_model.update(history.multiplier_category)
+        return self.markov_model.predict_next()
     
     def is_suspicious_p(self, number_of_ps: int, number_of_bs: int, number_of_pks: int) -> bool:
         if (number_of_bs < 23 or number_of_bs >= 26) and (number_of_ps < 20):
@@ -108,7 +121,7 @@ class MarkovModelStrategy(BettingStrategy):
         number_of_pks = categories.count('Pk')
         self.log.info(f'Number of Pks in lookback window: {number_of_pks}')
 
-        markov_probs = self.predict(categories)
+        markov_probs = self.predict_from_bet_history(bet_history)
         self.log.info(f'Markov Probabilities: {markov_probs}')
         
         max_category = max(markov_probs, key=markov_probs.get)
@@ -129,9 +142,18 @@ class MarkovModelStrategy(BettingStrategy):
             decided_multiplier.multiplier_for_box_two = self.base_multiplier_for_box_two
             # pass
         return decided_multiplier
-    
 
-strategy = MarkovModelStrategy(percentage_to_bet_per_round=0.005)
+    def decide_multipliers(self, game_data: pl.DataFrame) -> tuple[np.ndarray, np.ndarray]:
+        if self.base_multiplier_for_box_two <= 1.0:
+            self.base_multiplier_for_box_two = 1.5
+        has_lookback_window = np.arange(len(game_data)) >= self.lookback_window
+        return (
+            np.where(has_lookback_window, self.base_multiplier_for_box_one, 1.0),
+            np.where(has_lookback_window, self.base_multiplier_for_box_two, 1.0),
+        )
+
+
+strategy = MarkovModelStrategy(percentage_to_bet_per_round_for_box_one=0.005, percentage_to_bet_per_round_for_box_two=0.005)
 risk_manager = RiskManager(stop_loss=0.1, take_profit=0.2)
 data_source = DataSource(csv_file="sporty_aviator_data.csv")
 test_casino = Spribe()
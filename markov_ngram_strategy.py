@@ -3,14 +3,13 @@ import re
 import os
 import sys
 from typing_extensions import Any
-from time import sleep
-import importlib.util
 from collections import defaultdict, Counter, deque
 import json
 from hashlib import sha256
 
+import numpy as np
 import polars as pl
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 import logfire
 from dotenv import load_dotenv
 from celery import Celery
@@ -21,9 +20,10 @@ from pydantic_ai.providers.deepseek import DeepSeekProvider
 
 from bot.backtesting.backtest import Backtester
 from bot.casino import Sporty, Spribe
-from bot.data_source import BetHistory, LiveBetHistory
+from bot.data_source import BetHistory, LiveBetHistory, BetHistoryStore, CATEGORIES
 from bot.data_source.data_source import DataSource
 from bot.data_source.round_result import RoundResult
+from bot.prediction import OnlineMarkovModel, NgramIndex, PredictionModuleLoader, NgramCodeCache, generate_offline_ngram_code, CategoryRingBuffer
 from bot.strategy import BettingStrategy
 from bot.strategy.executor import Executor
 from bot.strategy.risk_manager import RiskManager
@@ -59,6 +59,10 @@ Requirements:
 )
 Agent.instrument_all()
 
+# Bump when the prompt changes, so code generated for the old prompt is no longer served from the cache
+PROMPT_VERSION = 1
+ngram_code_cache = NgramCodeCache(prompt_version=PROMPT_VERSION)
+
 
 def clean_code_output(code: str) -> str:
     return re.sub(r"```(?:python)?\n?|```", "", code).strip()
@@ -67,17 +71,17 @@ def write_celery_result_to_file(code: str, filename='ngram_predictions.py'):
     print(code)
     print(filename)
     try:
-        with open(filename, 'w') as f:
+        # Write a temporary file and rename it over the module, so the strategy never reads a partially written file
+        temporary_filename = f'{filename}.{os.getpid()}.tmp'
+        with open(temporary_filename, 'w') as f:
             f.write(code)
+        os.replace(temporary_filename, filename)
         print("N-gram code written to ngram_predictions.py")
     except Exception as e:
         print(f"Error writing to file: {e}")
 
-@celery_app.task(bind=True)
-def fetch_ngram_code_from_deepseek(data: list[str], filename="ngram_predictions.py"):
-    try:
-        print("Fetching N-gram code from DeepSeek...")
-        result = agent.run_sync(
+def generate_ngram_code(data: list[str]) -> str:
+    result = agent.run_sync(
             f"""
             You are analyzing the output of an online game called Aviator. The game emits a sequence of categories:
             - 'B' for values between 1.00 and 1.99
@@ -98,10 +102,25 @@ def fetch_ngram_code_from_deepseek(data: list[str], filename="ngram_predictions.
             Do NOT include markdown formatting (like triple backticks or ```python)!
             Do NOT include any explanations or comments!
             """
-        )
-        code = clean_code_output(result.data)
+    )
+    return clean_code_output(result.data)
 
-        write_celery_result_to_file(code)
+@celery_app.task(bind=True)
+def fetch_ngram_code_from_deepseek(self, data: list[str], filename="ngram_predictions.py", offline: bool = False):
+    try:
+        code = ngram_code_cache.get(data)
+        if code is None and offline:
+            # The stand-in is cheap to regenerate and is not cached, so it never shadows generated code
+            print("Generating N-gram code offline...")
+            code = generate_offline_ngram_code()
+        elif code is None:
+            print("Fetching N-gram code from DeepSeek...")
+            code = generate_ngram_code(data)
+            ngram_code_cache.put(data, code)
+        else:
+            print("Using cached N-gram code")
+
+        write_celery_result_to_file(code, filename)
     except Exception as e:
         print(f"Error in fetch_ngram_code_from_deepseek: {e}")
 
@@ -117,15 +136,23 @@ class PredictionHistory(BaseModel):
 
 
 class MarkovNgramStrategy(BettingStrategy):
-    prediction_module: Any = None
-    game_count: int = 0
-    recent_predictions: list[tuple[str, str, bool]] = []
-    rounds_skipped: int = 0
-    loss_streak_detected: bool = False
+    prediction_module: Any = Field(default=None, exclude=True)
+    prediction_module_loader: PredictionModuleLoader = Field(default=None, exclude=True)
+    game_count: int = Field(default=0, exclude=True)
+    recent_predictions: list[tuple[str, str, bool]] = Field(default=[], exclude=True)
+    rounds_skipped: int = Field(default=0, exclude=True)
+    loss_streak_detected: bool = Field(default=False, exclude=True)
     maximum_num_bet_history_to_categorize: int
     ngram_generation_interval: int
-    prediction_history: list[PredictionHistory] = []
-    prediction_history_storage: str = f'data/prediction_history_{datetime.now().strftime("%Y%m%d_%H%M%S")}.json'
+    ngram_generation_delay_rounds: int = 1
+    offline_ngram_generation: bool = False
+    prediction_history: list[PredictionHistory] = Field(default=[], exclude=True)
+    markov_model: OnlineMarkovModel = Field(default=None, exclude=True)
+    use_ngram_index: bool = False
+    ngram_order: int = 2
+    ngram_index: NgramIndex = Field(default=None, exclude=True)
+    category_buffer: CategoryRingBuffer = Field(default=None, exclude=True)
+    prediction_history_storage: str = Field(default=f'data/prediction_history_{datetime.now().strftime("%Y%m%d_%H%M%S")}.json', exclude=True)
 
     def __init__(self, percentage_to_bet_per_round: float, maximum_num_bet_history_to_categorize: int, ngram_generation_interval: int):
         super().__init__(
@@ -147,35 +174,27 @@ class MarkovNgramStrategy(BettingStrategy):
         """)
 
     def load_prediction_module(self, path='ngram_predictions.py'):
-        if not os.path.exists(path):
-            raise FileNotFoundError("N-gram prediction module not found.")
-
-        spec = importlib.util.spec_from_file_location("ngram_predictions", path)
-        module = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(module)
-        self.prediction_module = module
+        if self.prediction_module_loader is None or self.prediction_module_loader.path != path:
+            self.prediction_module_loader = PredictionModuleLoader(path)
+        self.prediction_module = self.prediction_module_loader.load()
 
     def request_ngram_update(self, category_sequence: list[str]):
         # Request N-gram code update from DeepSeek
-        fetch_ngram_code_from_deepseek.delay(category_sequence)
-
-    def convert_bet_history_to_dataframe(self, bet_history: list[BetHistory | LiveBetHistory]) -> pl.DataFrame:
-        data = [{"multiplier": bh.multiplier, "date": bh.date, 'time': bh.time} for bh in bet_history]
-        df = pl.DataFrame(data)
-        return df
+        if self.clock is not None:
+            # In backtests the update finishes a fixed number of rounds later instead of in a Celery worker
+            self.clock.schedule(fetch_ngram_code_from_deepseek, category_sequence, offline=self.offline_ngram_generation, delay_rounds=self.ngram_generation_delay_rounds)
+        else:
+            fetch_ngram_code_from_deepseek.delay(category_sequence, offline=self.offline_ngram_generation)
 
     def categorize_bet_history(self, bet_history: list[BetHistory | LiveBetHistory]) -> list[str]:
-        df = self.convert_bet_history_to_dataframe(bet_history)
-        new_categories = []
-        old_categories = list(df.get_column('multiplier'))
-        for i in old_categories:
-            if 1.00 <= i <= 1.99:
-                new_categories.append('B')
-            elif 2.00 <= i <= 9.99:
-                new_categories.append('P')
-            else:
-                new_categories.append('Pk')
-        return new_categories
+        return [history.multiplier_category for history in bet_history]
+
+    def buffer_bet_history(self, bet_history: BetHistoryStore) -> CategoryRingBuffer:
+        """Appends the categories of the rounds recorded since the last call to the ring buffer of the latest categories."""
+        if self.category_buffer is None or len(bet_history) < self.category_buffer.rounds:
+            self.category_buffer = CategoryRingBuffer(abs(self.maximum_num_bet_history_to_categorize))
+        self.category_buffer.extend(bet_history.multiplier_categories[self.category_buffer.rounds:])
+        return self.category_buffer
     
     def build_markov_model(self, history: list[str]) -> dict[str, dict[str, float]]:
         transitions = defaultdict(Counter)
@@ -199,10 +218,28 @@ class MarkovNgramStrategy(BettingStrategy):
         
         return markov_model[current_state]
 
-    def hybrid_predict(self, history: list[str], weight_ngram=0.6, weight_markov=0.4) -> str:
-        markov_model = self.build_markov_model(history)
-        current_state = history[-1]
-        markov_probs = self.markov_predict_next(markov_model, current_state)
+    def predict_from_bet_history(self, bet_history: BetHistoryStore) -> dict[str, float]:
+        """Feeds the rounds recorded since the last call to the online Markov model and predicts the next category."""
+        if self.markov_model is None or len(bet_history) < self.markov_model.rounds:
+            self.markov_model = OnlineMarkovModel(window=abs(self.maximum_num_bet_history_to_categorize))
+        for code in bet_history.multiplier_categories[self.markov_model.rounds:].tolist():
+            self.markov_model.update(CATEGORIES[code])
+        return self.markov_model.predict_next()
+
+    def index_bet_history(self, bet_history: BetHistoryStore) -> NgramIndex:
+        """Feeds the rounds recorded since the last call to the n-gram index, which then stands in for the generated prediction module."""
+        if self.ngram_index is None or len(bet_history) < self.ngram_index.rounds:
+            self.ngram_index = NgramIndex(order=self.ngram_order, window=abs(self.maximum_num_bet_history_to_categorize))
+        for code in bet_history.multiplier_categories[self.ngram_index.rounds:].tolist():
+            self.ngram_index.update(CATEGORIES[code])
+        return self.ngram_index
+
+    def hybrid_predict(self, history: list[str] | np.ndarray, weight_ngram=0.6, weight_markov=0.4, markov_probs: dict[str, float] = None) -> str:
+        if markov_probs is None:
+            categories = [CATEGORIES[code] for code in history.tolist()] if isinstance(history, np.ndarray) else history
+            markov_model = self.build_markov_model(categories)
+            current_state = categories[-1]
+            markov_probs = self.markov_predict_next(markov_model, current_state)
 
         # N-gram binary predictions
         ngram_scores = {
@@ -242,10 +279,11 @@ class MarkovNgramStrategy(BettingStrategy):
         with open(self.prediction_history_storage, 'w') as f:
             f.write(json.dumps([item.model_dump(mode='json') for item in self.prediction_history]))
 
-    def decide_multiplier(self, game_data: pl.DataFrame, bet_history: list[BetHistory | LiveBetHistory] = [], restart_strategy: bool = False) -> float:
+    def decide_multiplier(self, game_data: pl.DataFrame, bet_history: BetHistoryStore = None, restart_strategy: bool = False) -> float:
+        bet_history = self.bet_history_store(bet_history)
         self.game_count += 1
         self.log.info(f"Game count: {self.game_count}")
-        category_sequence = self.categorize_bet_history(bet_history[-self.maximum_num_bet_history_to_categorize:])
+        category_codes = self.buffer_bet_history(bet_history).view()
         multiplier = 1.0
 
         # Check for a streak of 2 losses
@@ -255,28 +293,34 @@ class MarkovNgramStrategy(BettingStrategy):
 
         if len(bet_history) > 0 and self.game_count > (abs(self.maximum_num_bet_history_to_categorize) + 3) and not self.loss_streak_detected:
             self.record_feedback(
-                'B' if 1.00 <= bet_history[-1].decided_multiplier <= 1.99 else 'P' if 2.00 <= bet_history[-1].decided_multiplier <= 9.99 else 'Pk',
-                category_sequence[-1]
+                bet_history[-1].decided_multiplier_one_category,
+                CATEGORIES[category_codes[-1]]
             )
             self.log.info(f"Accuracy: {self.accuracy()}")
-            self.prediction_history[-1].actual_category = category_sequence[-1]
+            self.prediction_history[-1].actual_category = CATEGORIES[category_codes[-1]]
             self.save_prediction_history()
 
         if self.game_count >= (abs(self.maximum_num_bet_history_to_categorize) + 3) and not self.loss_streak_detected:
-            try:
-                self.load_prediction_module()
-            except FileNotFoundError:
-                self.log.info('File not found')
-                return multiplier  # Default multiplier if predictions not ready
-
-            best_guess = self.hybrid_predict(category_sequence)
+            if self.use_ngram_index:
+                self.prediction_module = self.index_bet_history(bet_history)
+                history = category_codes
+            else:
+                try:
+                    self.load_prediction_module()
+                except (FileNotFoundError, ImportError) as e:
+                    self.log.info(f'Prediction module not ready: {e}')
+                    return multiplier  # Default multiplier if predictions not ready
+                # Generated modules take the categories as a list of strings
+                history = self.category_buffer.categories()
+
+            best_guess = self.hybrid_predict(history, markov_probs=self.predict_from_bet_history(bet_history))
             self.log.info(f"Prediction: {self.prediction_history[-1]}")
             multiplier = 1.0 if best_guess == 'B' else 2.0
                 
-        if self.game_count > abs(self.maximum_num_bet_history_to_categorize) and self.game_count % self.ngram_generation_interval == 1:
+        if not self.use_ngram_index and self.game_count > abs(self.maximum_num_bet_history_to_categorize) and self.game_count % self.ngram_generation_interval == 1:
             # Request N-gram update every 50 games after the first 200
             self.log.info("Requesting N-gram update...")
-            self.request_ngram_update(category_sequence)
+            self.request_ngram_update(self.category_buffer.categories())
 
         if self.loss_streak_detected:
             self.rounds_skipped += 1
@@ -286,12 +330,6 @@ class MarkovNgramStrategy(BettingStrategy):
                 self.rounds_skipped = 0
         
         return multiplier
-    
-    def after_game_round_during_backtesting(self):
-        if self.game_count == (abs(self.maximum_num_bet_history_to_categorize) + 1):
-            sleep(15)
-        if self.game_count >= abs(self.maximum_num_bet_history_to_categorize):
-            sleep(3)
 
 strategy = MarkovNgramStrategy(
     percentage_to_bet_per_round=0.001,
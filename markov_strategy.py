@@ -10,7 +10,7 @@ import json
 from hashlib import sha256
 
 import polars as pl
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 import logfire
 from dotenv import load_dotenv
 from celery import Celery
@@ -25,6 +25,7 @@ from bot.data_source import BetHistory, LiveBetHistory
 from bot.data_source.data_source import DataSource
 from bot.data_source.decided_multiplier import DecidedMultiplier
 from bot.data_source.round_result import RoundResult
+from bot.prediction import OnlineMarkovModel
 from bot.strategy import BettingStrategy
 from bot.strategy.executor import Executor
 from bot.strategy.risk_manager import RiskManager
@@ -39,7 +40,9 @@ class PredictionHistory(BaseModel):
 
 
 class MarkovStrategy(BettingStrategy):
-    recent_predictions: list[tuple[str, str, bool]] = []
+    recent_predictions: list[tuple[str, str, bool]] = Field(default=[], exclude=True)
+    markov_window: int = 45
+    markov_model: OnlineMarkovModel = Field(default=None, exclude=True)
 
     def introduce_strategy(self):
         self.log.info(f"""
@@ -76,6 +79,14 @@ class MarkovStrategy(BettingStrategy):
         current_state = history[-1]
         markov_probs = self.markov_predict_next(markov_model, current_state)
         return markov_probs
+
+    def predict_from_bet_history(self, bet_history: list[BetHistory | LiveBetHistory]) -> dict[str, float]:
+        """Feeds the rounds recorded since the last call to the online Markov model and predicts the next category."""
+        if self.markov_model is None or len(bet_history) < self.markov_model.rounds:
+            self.markov_model = OnlineMarkovModel(window=self.markov_window)
+        for history in bet_history[self.markov_model.rounds:]:
+            self.markov_model.update(history.multiplier_category)
+        return self.markov_model.predict_next()
     
     def record_feedback(self, prediction: str, actual: str):
         hit = prediction == actual or (prediction in ['P', 'Pk'] and actual in ['P', 'Pk'])
@@ -97,8 +108,7 @@ class MarkovStrategy(BettingStrategy):
         )
 
         if len(bet_history) >= 0:
-            categories = [history.multiplier_category for history in bet_history[-45:]]
-            markov_probs = self.predict(categories)
+            markov_probs = self.predict_from_bet_history(bet_history)
 
             # Rule 1: If markov_probs_p == markov_probs_pk, then choose Pk(10.0)
             if round(markov_probs['P'], 6) == round(markov_probs['Pk'], 6):
@@ -1,12 +1,14 @@
 import sys
 import polars as pl
+from pydantic import Field
 
 from bot.backtesting.backtest import Backtester
 from bot.casino import Spribe, Sporty
 from bot.data_source import DataSource
 from bot.data_source import DecidedMultiplier
+from bot.indicators import BlueDebtTracker, scan_debts, track_debts
 from bot.strategy import BettingStrategy
-from bot.data_source import BetHistory, RoundResult, LiveBetHistory
+from bot.data_source import BetHistory, BetHistoryStore, RoundResult, LiveBetHistory
 from bot.strategy.executor import Executor
 from bot.strategy.risk_manager import RiskManager
 
@@ -22,6 +24,7 @@ class EagleShot(BettingStrategy):
         multiplier_for_box_two=1.00,
     )
     start_index: int = 0
+    debt_tracker: BlueDebtTracker = Field(default=None, exclude=True)
 
     def introduce_strategy(self):
         self.log.info(f"""
@@ -58,37 +61,24 @@ class EagleShot(BettingStrategy):
         Returns:
             list of float: List of target multipliers needed to resolve unpaid Blue debts.
         """
-        targets = []
-        i = 0
-        while i < len(multipliers):
-            current = multipliers[i]
-            
-            if lower_bound <= current < upper_bound:
-                # Start a debt sequence
-                target = initial_target  # Initial target: 100% profit
-                resolved = False
-                for j in range(i + 1, len(multipliers)):
-                    if multipliers[j] >= target:
-                        resolved = True
-                        break
-                    else:
-                        target = round(target + increment, 2)  # Increase target by +100%
-                if not resolved:
-                    targets.append(target)
-            
-            i += 1
-
-        return targets
+        return scan_debts(multipliers, initial_target, lower_bound, upper_bound, increment)
     
     def sort(self, multipliers: list[float], minimum_multiplier: float = 10.00) -> list[float]:
         filtered_multipliers = [m for m in multipliers if m >= minimum_multiplier]
         return sorted(filtered_multipliers)
 
-    def decide_multiplier(self, game_data: pl.DataFrame, bet_history: list[BetHistory | LiveBetHistory] = [], restart_strategy: bool = False) -> DecidedMultiplier:
-        multipliers = [history.multiplier for history in bet_history]
-        target_multipliers = self.scanner(multipliers, self.initial_target_multiplier, self.lower_bound, self.upper_bound, self.increment)
-        if len(target_multipliers) > 0:
-            sorted_multipliers = self.sort(target_multipliers, self.minimum_multiplier)
+    def decide_multiplier(self, game_data: pl.DataFrame, bet_history: BetHistoryStore = None, restart_strategy: bool = False) -> DecidedMultiplier:
+        bet_history = self.bet_history_store(bet_history)
+        debt_tracker = self.debt_tracker = track_debts(
+            self.debt_tracker,
+            bet_history.multipliers,
+            self.initial_target_multiplier,
+            self.lower_bound,
+            self.upper_bound,
+            self.increment,
+        )
+        if len(debt_tracker.open_debts) > 0:
+            sorted_multipliers = debt_tracker.sorted_targets(self.minimum_multiplier)
             self.log.info(f'Sorted Target Multipliers: {sorted_multipliers}')
             decided_multiplier = DecidedMultiplier(
                 multiplier_for_box_one=1.00,